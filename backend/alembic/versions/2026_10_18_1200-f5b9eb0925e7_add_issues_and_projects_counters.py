@@ -0,0 +1,138 @@
+"""Add issues counters to project and projects counter to auth_user.
+
+Revision ID: f5b9eb0925e7
+Revises: 4389da4f3d25
+Create Date: 2026-10-18 12:00:41.512346+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b9eb0925e7'
+down_revision: Union[str, None] = '4389da4f3d25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PROJECT_COUNTERS = (
+    'issues_count', 'to_do_count', 'in_progress_count', 'done_count'
+)
+
+
+def upgrade() -> None:
+    for column in PROJECT_COUNTERS:
+        op.add_column('project', sa.Column(column, sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('auth_user', sa.Column('projects_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION issue_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE project SET
+                    issues_count = issues_count - 1,
+                    to_do_count = to_do_count - (OLD.status = 'To do')::int,
+                    in_progress_count = (
+                        in_progress_count - (OLD.status = 'In progress')::int
+                    ),
+                    done_count = done_count - (OLD.status = 'Done')::int
+                WHERE id = OLD.project_id;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE project SET
+                    issues_count = issues_count + 1,
+                    to_do_count = to_do_count + (NEW.status = 'To do')::int,
+                    in_progress_count = (
+                        in_progress_count + (NEW.status = 'In progress')::int
+                    ),
+                    done_count = done_count + (NEW.status = 'Done')::int
+                WHERE id = NEW.project_id;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER issue_counters
+        AFTER INSERT OR DELETE ON issue
+        FOR EACH ROW EXECUTE FUNCTION issue_counters()
+    """)
+    op.execute("""
+        CREATE TRIGGER issue_counters_update
+        AFTER UPDATE OF status, project_id ON issue
+        FOR EACH ROW
+        WHEN (
+            OLD.status IS DISTINCT FROM NEW.status
+            OR OLD.project_id IS DISTINCT FROM NEW.project_id
+        )
+        EXECUTE FUNCTION issue_counters()
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION project_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                UPDATE auth_user SET projects_count = projects_count - 1
+                WHERE id = OLD.author_id;
+            ELSE
+                UPDATE auth_user SET projects_count = projects_count + 1
+                WHERE id = NEW.author_id;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER project_counters
+        AFTER INSERT OR DELETE ON project
+        FOR EACH ROW EXECUTE FUNCTION project_counters()
+    """)
+
+    # Backfill the existing rows, the triggers keep them from now on.
+    op.execute("""
+        UPDATE project SET
+            issues_count = counts.issues_count,
+            to_do_count = counts.to_do_count,
+            in_progress_count = counts.in_progress_count,
+            done_count = counts.done_count
+        FROM (
+            SELECT
+                project_id,
+                count(*) AS issues_count,
+                count(*) FILTER (WHERE status = 'To do') AS to_do_count,
+                count(*) FILTER (
+                    WHERE status = 'In progress'
+                ) AS in_progress_count,
+                count(*) FILTER (WHERE status = 'Done') AS done_count
+            FROM issue
+            GROUP BY project_id
+        ) AS counts
+        WHERE project.id = counts.project_id
+    """)
+    op.execute("""
+        UPDATE auth_user SET projects_count = counts.projects_count
+        FROM (
+            SELECT author_id, count(*) AS projects_count
+            FROM project
+            GROUP BY author_id
+        ) AS counts
+        WHERE auth_user.id = counts.author_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER project_counters ON project")
+    op.execute("DROP FUNCTION project_counters()")
+    op.execute("DROP TRIGGER issue_counters_update ON issue")
+    op.execute("DROP TRIGGER issue_counters ON issue")
+    op.execute("DROP FUNCTION issue_counters()")
+
+    op.drop_column('auth_user', 'projects_count')
+    for column in reversed(PROJECT_COUNTERS):
+        op.drop_column('project', column)
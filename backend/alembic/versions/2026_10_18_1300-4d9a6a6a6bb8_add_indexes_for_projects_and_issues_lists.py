@@ -0,0 +1,31 @@
+"""Add indexes for projects and issues lists.
+
+Revision ID: 4d9a6a6a6bb8
+Revises: f5b9eb0925e7
+Create Date: 2026-10-18 13:00:17.904532+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d9a6a6a6bb8'
+down_revision: Union[str, None] = 'f5b9eb0925e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY doesn't block writes, but can't run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index('project_list_idx', 'project', ['author_id', sa.text('favorite DESC'), 'created', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('issue_list_idx', 'issue', ['author_id', 'project_id', 'type', 'created', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('issue_list_idx', table_name='issue', postgresql_concurrently=True)
+        op.drop_index('project_list_idx', table_name='project', postgresql_concurrently=True)
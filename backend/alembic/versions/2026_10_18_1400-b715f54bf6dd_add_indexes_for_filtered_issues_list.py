@@ -0,0 +1,31 @@
+"""Add indexes for filtered and sorted issues list.
+
+Revision ID: b715f54bf6dd
+Revises: 4d9a6a6a6bb8
+Create Date: 2026-10-18 14:00:52.338170+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b715f54bf6dd'
+down_revision: Union[str, None] = '4d9a6a6a6bb8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('issue_status_idx', 'issue', ['author_id', 'project_id', 'status', 'type', 'created', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('issue_created_idx', 'issue', ['author_id', 'project_id', 'created', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('issue_updated_idx', 'issue', ['author_id', 'project_id', 'updated', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('issue_updated_idx', table_name='issue', postgresql_concurrently=True)
+        op.drop_index('issue_created_idx', table_name='issue', postgresql_concurrently=True)
+        op.drop_index('issue_status_idx', table_name='issue', postgresql_concurrently=True)
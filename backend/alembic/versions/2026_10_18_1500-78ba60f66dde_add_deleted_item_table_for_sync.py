@@ -0,0 +1,107 @@
+"""Add deleted_item table and indexes by updated for sync.
+
+Revision ID: 78ba60f66dde
+Revises: b715f54bf6dd
+Create Date: 2026-10-18 15:00:06.271954+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '78ba60f66dde'
+down_revision: Union[str, None] = 'b715f54bf6dd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def issue_counters_function(touch_project: bool) -> str:
+    # With touch_project the project is sent by /sync with its new counters.
+    updated = "updated = now()," if touch_project else ""
+
+    return f"""
+        CREATE OR REPLACE FUNCTION issue_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE project SET
+                    {updated}
+                    issues_count = issues_count - 1,
+                    to_do_count = to_do_count - (OLD.status = 'To do')::int,
+                    in_progress_count = (
+                        in_progress_count - (OLD.status = 'In progress')::int
+                    ),
+                    done_count = done_count - (OLD.status = 'Done')::int
+                WHERE id = OLD.project_id;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE project SET
+                    {updated}
+                    issues_count = issues_count + 1,
+                    to_do_count = to_do_count + (NEW.status = 'To do')::int,
+                    in_progress_count = (
+                        in_progress_count + (NEW.status = 'In progress')::int
+                    ),
+                    done_count = done_count + (NEW.status = 'Done')::int
+                WHERE id = NEW.project_id;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade() -> None:
+    op.create_table('deleted_item',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('item_type', sa.VARCHAR(length=10), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_deleted_item_id'), 'deleted_item', ['id'], unique=False)
+    op.create_index('deleted_item_author_idx', 'deleted_item', ['author_id', 'deleted'], unique=False)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION log_deleted_item() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO deleted_item (author_id, item_type, item_id)
+            VALUES (OLD.author_id, TG_TABLE_NAME, OLD.id);
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in ('project', 'issue'):
+        op.execute(f"""
+            CREATE TRIGGER {table}_log_deleted
+            AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION log_deleted_item()
+        """)
+
+    op.execute(issue_counters_function(touch_project=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index('project_sync_idx', 'project', ['author_id', 'updated'], unique=False, postgresql_concurrently=True)
+        op.create_index('issue_sync_idx', 'issue', ['author_id', 'updated'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('issue_sync_idx', table_name='issue', postgresql_concurrently=True)
+        op.drop_index('project_sync_idx', table_name='project', postgresql_concurrently=True)
+
+    op.execute(issue_counters_function(touch_project=False))
+
+    for table in ('issue', 'project'):
+        op.execute(f"DROP TRIGGER {table}_log_deleted ON {table}")
+    op.execute("DROP FUNCTION log_deleted_item()")
+
+    op.drop_index('deleted_item_author_idx', table_name='deleted_item')
+    op.drop_index(op.f('ix_deleted_item_id'), table_name='deleted_item')
+    op.drop_table('deleted_item')
@@ -0,0 +1,64 @@
+"""Add weighted search_vector columns for fulltext search.
+
+Revision ID: 90949d187d1e
+Revises: 78ba60f66dde
+Create Date: 2026-10-18 16:00:38.710254+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '90949d187d1e'
+down_revision: Union[str, None] = '78ba60f66dde'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTORS = {
+    'project': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(key, '')), 'B')"
+    ),
+    'issue': (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    )
+}
+
+
+def swap_fts_index(table: str, columns: list) -> None:
+    """
+    Replace {table}_fts_idx with a GIN index on columns.
+
+    The new index is built under a temporary name and renamed after the old
+    one is dropped, so the table is never left without a fulltext index.
+    """
+    name = f'{table}_fts_idx'
+
+    with op.get_context().autocommit_block():
+        op.create_index(f'{name}_new', table, columns, unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    op.execute(f'ALTER INDEX {name}_new RENAME TO {name}')
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites the table.
+    for table, expression in SEARCH_VECTORS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(expression, persisted=True), nullable=False))
+
+    for table in SEARCH_VECTORS:
+        swap_fts_index(table, ['search_vector'])
+
+
+def downgrade() -> None:
+    swap_fts_index('issue', [sa.text("to_tsvector('english', title || ' ' || description)")])
+    swap_fts_index('project', [sa.text("to_tsvector('english', name || ' ' || key)")])
+
+    for table in reversed(SEARCH_VECTORS):
+        op.drop_column(table, 'search_vector')
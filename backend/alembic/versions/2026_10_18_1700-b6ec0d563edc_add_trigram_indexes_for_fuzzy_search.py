@@ -0,0 +1,35 @@
+"""Add trigram indexes for fuzzy search.
+
+Revision ID: b6ec0d563edc
+Revises: 90949d187d1e
+Create Date: 2026-10-18 17:00:12.493817+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6ec0d563edc'
+down_revision: Union[str, None] = '90949d187d1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.create_index('project_name_trgm_idx', 'project', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('project_key_trgm_idx', 'project', ['key'], unique=False, postgresql_using='gin', postgresql_ops={'key': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('issue_title_trgm_idx', 'issue', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('issue_title_trgm_idx', table_name='issue', postgresql_concurrently=True)
+        op.drop_index('project_key_trgm_idx', table_name='project', postgresql_concurrently=True)
+        op.drop_index('project_name_trgm_idx', table_name='project', postgresql_concurrently=True)
+
+    # The extension is left, other objects could already depend on it.
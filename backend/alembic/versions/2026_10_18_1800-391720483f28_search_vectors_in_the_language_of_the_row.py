@@ -0,0 +1,144 @@
+"""Compute search vectors in the language of the row by triggers.
+
+Revision ID: 391720483f28
+Revises: b6ec0d563edc
+Create Date: 2026-10-18 18:00:47.215390+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '391720483f28'
+down_revision: Union[str, None] = 'b6ec0d563edc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_COLUMNS = {
+    'project': (('name', 'A'), ('key', 'B')),
+    'issue': (('title', 'A'), ('description', 'B'))
+}
+
+# Rows updated per transaction of the backfill.
+BACKFILL_BATCH_SIZE = 10000
+
+
+def search_vector(table: str, language: str | None = None, row: str = '') -> str:
+    texts = [f"coalesce({row}{column}, '')" for column, _ in SEARCH_COLUMNS[table]]
+
+    if language is None:
+        language = "search_language(" + " || ' ' || ".join(texts) + ")"
+
+    return " || ".join(
+        f"setweight(to_tsvector({language}, {text}), '{weight}')"
+        for text, (_, weight) in zip(texts, SEARCH_COLUMNS[table])
+    )
+
+
+def search_vector_function(table: str, column: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION {table}_search_vector() RETURNS trigger AS $$
+        BEGIN
+            NEW.{column} := {search_vector(table, row='NEW.')};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def backfill(table: str, expression: str) -> None:
+    # Each batch is committed, so the rows are locked only for a batch.
+    # Must run in an autocommit block.
+    op.execute(f"""
+        DO $$
+        DECLARE
+            last_id integer := 0;
+            max_id integer := (SELECT coalesce(max(id), 0) FROM {table});
+        BEGIN
+            WHILE last_id < max_id LOOP
+                UPDATE {table} SET search_vector_new = {expression}
+                WHERE id > last_id AND id <= last_id + {BACKFILL_BATCH_SIZE};
+                last_id := last_id + {BACKFILL_BATCH_SIZE};
+                COMMIT;
+            END LOOP;
+        END
+        $$
+    """)
+
+
+def swap_search_vector(table: str) -> None:
+    """
+    Replace search_vector of the table with search_vector_new
+    and its index with {table}_fts_idx_new in a short transaction.
+    """
+    op.drop_column(table, 'search_vector')
+    op.alter_column(table, 'search_vector_new', new_column_name='search_vector')
+    op.execute(f'ALTER INDEX {table}_fts_idx_new RENAME TO {table}_fts_idx')
+
+
+def upgrade() -> None:
+    """
+    A generated column can't be altered or made of a plain one without
+    rewriting the table under an exclusive lock, so search_vector becomes
+    a plain column kept by a trigger. The new column is backfilled in batches
+    and indexed concurrently next to the old one, which serves the searches
+    until both are swapped.
+    """
+    op.execute("""
+        CREATE OR REPLACE FUNCTION search_language(text) RETURNS regconfig AS $$
+            SELECT CASE
+                WHEN $1 ~ '[а-яёА-ЯЁ]' THEN 'russian'::regconfig
+                WHEN $1 ~ '[a-zA-Z]' THEN 'english'::regconfig
+                ELSE 'simple'::regconfig
+            END
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    """)
+
+    for table, columns in SEARCH_COLUMNS.items():
+        op.add_column(table, sa.Column('search_vector_new', postgresql.TSVECTOR(), nullable=True))
+        op.execute(search_vector_function(table, 'search_vector_new'))
+        op.execute(f"""
+            CREATE TRIGGER {table}_search_vector
+            BEFORE INSERT OR UPDATE OF {', '.join(column for column, _ in columns)} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector()
+        """)
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_COLUMNS:
+            backfill(table, search_vector(table))
+            op.create_index(f'{table}_fts_idx_new', table, ['search_vector_new'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+            # SET NOT NULL below uses the validated constraint
+            # instead of scanning the table under the exclusive lock.
+            op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_search_vector_not_null CHECK (search_vector_new IS NOT NULL) NOT VALID')
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_search_vector_not_null')
+
+    for table in SEARCH_COLUMNS:
+        op.alter_column(table, 'search_vector_new', nullable=False)
+        op.drop_constraint(f'{table}_search_vector_not_null', table)
+        swap_search_vector(table)
+        op.execute(search_vector_function(table, 'search_vector'))
+
+
+def downgrade() -> None:
+    """
+    Needs downtime on large tables: adding the generated column back
+    rewrites the table under an exclusive lock, that blocks reads and writes.
+    """
+    for table in SEARCH_COLUMNS:
+        op.add_column(table, sa.Column('search_vector_new', postgresql.TSVECTOR(), sa.Computed(search_vector(table, "'english'"), persisted=True), nullable=False))
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_COLUMNS:
+            op.create_index(f'{table}_fts_idx_new', table, ['search_vector_new'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+    for table in SEARCH_COLUMNS:
+        op.execute(f'DROP TRIGGER {table}_search_vector ON {table}')
+        op.execute(f'DROP FUNCTION {table}_search_vector()')
+        swap_search_vector(table)
+
+    op.execute("DROP FUNCTION search_language(text)")
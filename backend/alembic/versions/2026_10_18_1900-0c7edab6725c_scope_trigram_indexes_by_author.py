@@ -0,0 +1,48 @@
+"""Scope trigram indexes of fuzzy search by author.
+
+Revision ID: 0c7edab6725c
+Revises: 391720483f28
+Create Date: 2026-10-18 19:00:21.603118+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7edab6725c'
+down_revision: Union[str, None] = '391720483f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = {
+    'project_name_trgm_idx': ('project', 'name'),
+    'project_key_trgm_idx': ('project', 'key'),
+    'issue_title_trgm_idx': ('issue', 'title')
+}
+
+
+def swap_trigram_indexes(with_author: bool) -> None:
+    # The new indexes are built under temporary names and renamed
+    # after the old ones are dropped, so the search always has them.
+    for name, (table, column) in TRIGRAM_INDEXES.items():
+        columns = ['author_id', column] if with_author else [column]
+
+        with op.get_context().autocommit_block():
+            op.create_index(f'{name}_new', table, columns, unique=False, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}, postgresql_concurrently=True)
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+        op.execute(f'ALTER INDEX {name}_new RENAME TO {name}')
+
+
+def upgrade() -> None:
+    # author_id in a GIN index, so only the rows of the author are matched.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    swap_trigram_indexes(with_author=True)
+
+
+def downgrade() -> None:
+    swap_trigram_indexes(with_author=False)
+    # The extension is left, other objects could already depend on it.
@@ -0,0 +1,85 @@
+"""
+Compare cached list pages stored as plain JSON (model_dump_json)
+and as encoded by utils.cache.cache_encode.
+
+Reports bytes per key and encode/decode latency for several page sizes.
+Doesn't need running Postgres or Redis:
+
+    cd backend && python benchmarks/cache_encoding.py
+"""
+import os
+import sys
+import timeit
+
+from datetime import datetime, timezone
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+# The engine is created on import, but never connects here.
+os.environ.setdefault("DB_URI", "postgresql+asyncpg://bench@localhost/bench")
+
+from config import CACHE_COMPRESS_LEVEL  # noqa: E402
+from utils.cache import cache_encode, cache_decode  # noqa: E402
+from utils.pagination import PaginatedResponse  # noqa: E402
+from issues.schemas import PaginationIssue  # noqa: E402
+
+
+def make_page(limit: int) -> PaginatedResponse:
+    now = datetime.now(timezone.utc)
+    issues = [
+        PaginationIssue(
+            id=i,
+            project_id=1,
+            title=f"Issue number {i} about the login form",
+            description="Steps to reproduce: open the page, press the button.",
+            type="Bug" if i % 3 else "Feature",
+            priority="Medium",
+            status="To do",
+            created=now,
+            updated=now
+        )
+        for i in range(limit)
+    ]
+
+    return PaginatedResponse(
+        count=1000,
+        page=1,
+        next_page=2,
+        prev_page=None,
+        total_pages=1000 // limit,
+        results=issues
+    )
+
+
+def bench(func, number: int) -> float:
+    """ Return microseconds per call. """
+    return timeit.timeit(func, number=number) / number * 1_000_000
+
+
+def main():
+    print(f"zlib level {CACHE_COMPRESS_LEVEL}")
+    print(
+        f"{'limit':>6} {'json B':>8} {'stored B':>9} {'ratio':>6} "
+        f"{'dump us':>8} {'dump+enc us':>12} {'dec us':>7}"
+    )
+
+    for limit in (10, 50, 100, 500):
+        page = make_page(limit)
+        plain = page.model_dump_json().encode()
+        stored = cache_encode(plain)
+
+        number = 2000 if limit <= 100 else 200
+        dump = bench(lambda: page.model_dump_json().encode(), number)
+        dump_encode = bench(
+            lambda: cache_encode(page.model_dump_json().encode()), number
+        )
+        decode = bench(lambda: cache_decode(stored), number)
+
+        print(
+            f"{limit:>6} {len(plain):>8} {len(stored):>9} "
+            f"{len(stored) / len(plain):>6.2f} "
+            f"{dump:>8.1f} {dump_encode:>12.1f} {decode:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Compare the search in one statement (see search_statement)
+with one statement per section, as it was done before,
+and measure the typeahead modes (their p95 should be under 20 ms)
+and the search in English and Russian, with how many of the issues
+in the language are found by the inflected words.
+
+The authors have the same projects and issues, so a search, that isn't
+scoped by the author in its indexes, gets slower with their number.
+
+The data is seeded in a transaction, that is rolled back at the end.
+The database is TEST_DB_URI, unless another one is passed:
+
+    cd backend && python benchmarks/search_queries.py [iterations] [db_uri]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+# The engine is created on import, but never connects here.
+os.environ.setdefault("DB_URI", "postgresql+asyncpg://bench@localhost/bench")
+
+from sqlalchemy import NullPool, select, func, text, true  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession, async_sessionmaker, create_async_engine
+)
+
+from config import TEST_DB_URI  # noqa: E402
+from projects.models import Project  # noqa: E402
+from issues.models import Issue  # noqa: E402
+from search.crud import (  # noqa: E402
+    PROJECT_COLUMNS, ISSUE_COLUMNS,
+    search_statement, _fulltext_section, _tsquery
+)
+from search.schemas import SearchMode  # noqa: E402
+
+
+# Half of the issues are in English, the other half are in Russian.
+QUERIES = {
+    "english": {
+        SearchMode.words: "benchmarks issues",
+        SearchMode.prefix: "benchm iss",
+        SearchMode.fuzzy: "benchmrk"
+    },
+    "russian": {
+        SearchMode.words: "проверочные задачи",
+        SearchMode.prefix: "провер зад",
+        SearchMode.fuzzy: "проверочня"
+    }
+}
+LIMIT = 10
+AUTHORS = 20
+
+
+async def seed(session: AsyncSession) -> int:
+    """
+    Seed AUTHORS users with 50 projects of 100 issues each,
+    return id of the one the searches are measured for.
+    Odd ones are in Russian.
+    """
+    await session.execute(text("""
+        INSERT INTO auth_user (username, hashed_password, first_name, email)
+        SELECT
+            'search_benchmark_' || i, '', '',
+            'search_benchmark_' || i || '@test.com'
+        FROM generate_series(1, :authors) AS i
+    """), {"authors": AUTHORS})
+    await session.execute(text("""
+        INSERT INTO project (name, key, author_id)
+        SELECT
+            CASE
+                WHEN i % 2 = 0 THEN 'Benchmark '
+                ELSE 'Проверка '
+            END || i,
+            'BENCH' || i,
+            auth_user.id
+        FROM auth_user, generate_series(1, 50) AS i
+        WHERE auth_user.username LIKE 'search_benchmark_%'
+    """))
+    await session.execute(text("""
+        INSERT INTO issue (
+            project_id, author_id, title, description,
+            type, priority, status
+        )
+        SELECT
+            project.id, project.author_id,
+            CASE
+                WHEN i % 2 = 0 THEN 'Benchmark issue '
+                ELSE 'Проверочная задача '
+            END || i,
+            CASE
+                WHEN i % 2 = 0 THEN 'Issue number '
+                ELSE 'Задача номер '
+            END || i,
+            'Bug', 'Medium', 'To do'
+        FROM project
+        JOIN auth_user ON auth_user.id = project.author_id,
+        generate_series(1, 100) AS i
+        WHERE auth_user.username LIKE 'search_benchmark_%'
+    """))
+    await session.execute(text("ANALYZE auth_user, project, issue"))
+    return await session.scalar(text(
+        "SELECT id FROM auth_user WHERE username = 'search_benchmark_1'"
+    ))
+
+
+async def one_statement(
+    session: AsyncSession,
+    user_id: int,
+    q: str,
+    mode: SearchMode
+):
+    await session.execute(search_statement(q, user_id, LIMIT, mode=mode.value))
+
+
+async def statement_per_section(
+    session: AsyncSession,
+    user_id: int,
+    q: str,
+    mode: SearchMode
+):
+    for model, section, columns in (
+        (Project, "project", PROJECT_COLUMNS),
+        (Issue, "issue", ISSUE_COLUMNS)
+    ):
+        await session.execute(_fulltext_section(
+            model, section, columns, _tsquery(q, mode.value), user_id, LIMIT
+        ))
+
+
+async def found_issues(session: AsyncSession, user_id: int, q: str) -> int:
+    """ Return the number of all the issues, that match q. """
+    tsquery = _tsquery(q)
+
+    return await session.scalar(
+        select(func.count())
+        .select_from(Issue)
+        .join(tsquery, true())
+        .where(
+            Issue.author_id == user_id,
+            Issue.search_vector.bool_op("@@")(tsquery.c.tsquery)
+        )
+    )
+
+
+async def measure(
+    variant,
+    session: AsyncSession,
+    user_id: int,
+    q: str,
+    mode: SearchMode,
+    n: int
+):
+    """ Return median and 95th percentile of variant latency in ms. """
+    await variant(session, user_id, q, mode)
+
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        await variant(session, user_id, q, mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(n * 0.95) - 1]
+
+
+async def main(n: int, db_uri: str):
+    engine = create_async_engine(db_uri, poolclass=NullPool)
+
+    async with async_sessionmaker(engine)() as session:
+        user_id = await seed(session)
+
+        for language, queries in QUERIES.items():
+            found = await found_issues(
+                session, user_id, queries[SearchMode.words]
+            )
+            print(f"{language}: found {found} of 2500 issues")
+
+            for variant, mode in (
+                (statement_per_section, SearchMode.words),
+                (one_statement, SearchMode.words),
+                (one_statement, SearchMode.prefix),
+                (one_statement, SearchMode.fuzzy)
+            ):
+                median, p95 = await measure(
+                    variant, session, user_id, queries[mode], mode, n
+                )
+                print(
+                    f"{language} {variant.__name__} ({mode.value}): "
+                    f"median {median:.2f} ms, p95 {p95:.2f} ms"
+                )
+
+        await session.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("iterations", type=int, nargs="?", default=200)
+    parser.add_argument("db_uri", nargs="?", default=TEST_DB_URI)
+    args = parser.parse_args()
+
+    if not args.db_uri:
+        parser.error("pass db_uri or set TEST_DB_URI")
+    asyncio.run(main(args.iterations, args.db_uri))
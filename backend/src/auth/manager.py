@@ -91,6 +91,7 @@ fastapi_users = CustomFastAPIUsers[User, int](
 )
 
 current_active_user = fastapi_users.current_user(active=True)
+current_superuser = fastapi_users.current_user(active=True, superuser=True)
 
 jwt_auth_router = fastapi_users.get_auth_router(
     jwt_backend,
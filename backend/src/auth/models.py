@@ -9,7 +9,7 @@ from sqlalchemy import VARCHAR, DateTime, false, true, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from utils.db import Base, get_async_session, intpk
+from utils.db import Base, get_async_session, intpk, counter
 
 
 user = Annotated[str, mapped_column(VARCHAR(length=150))]
@@ -32,6 +32,7 @@ class User(Base):
     date_joined: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
     )
+    projects_count: Mapped[counter]
 
 
 async def get_user_db(session: AsyncSession = Depends(get_async_session)):
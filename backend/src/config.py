@@ -9,7 +9,53 @@ TEST_DB_URI = os.environ.get("TEST_DB_URI")
 
 REDIS_USER = os.environ.get("REDIS_USER")
 REDIS_PASSWORD = os.environ.get("REDIS_PASSWORD")
+REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 10))
+REDIS_CACHE_MAX_CONNECTIONS = int(
+    os.environ.get("REDIS_CACHE_MAX_CONNECTIONS", 20)
+)
+REDIS_CONNECT_TIMEOUT = float(os.environ.get("REDIS_CONNECT_TIMEOUT", 1))
 REDIS_EXPIRE_TIME = 600
+REDIS_STALE_TIME = 300
+# Pages up to this one are refreshed right after a write.
+CACHE_HOT_PAGES = 1
+REDIS_VERSION_EXPIRE_TIME = 86400
+
+LOCAL_CACHE_MAX_SIZE = 1000
+LOCAL_CACHE_EXPIRE_TIME = 30
+
+CACHE_LOCK_TIMEOUT = 5
+CACHE_LOCK_WAIT_TIME = 3
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
+# Deleted keys are kept as tombstones this long (in seconds), so reads,
+# that selected the row before it was deleted, don't cache it again.
+CACHE_TOMBSTONE_TIME = 60
+
+# Cached values of this size (in bytes) and bigger are compressed.
+CACHE_COMPRESS_MIN_SIZE = 1024
+CACHE_COMPRESS_LEVEL = 1
+
+# Cache operations, that take longer, are failed and the cache is bypassed.
+CACHE_OPERATION_TIMEOUT = float(os.environ.get("CACHE_OPERATION_TIMEOUT", 0.2))
+# Cache operations wait this long for a free connection, when all of them
+# are in use. Less than CACHE_OPERATION_TIMEOUT, so a burst of requests
+# isn't taken for slow Redis.
+REDIS_CACHE_POOL_TIMEOUT = float(
+    os.environ.get("REDIS_CACHE_POOL_TIMEOUT", 0.1)
+)
+# The cache is bypassed for RESET_TIME seconds after MAX_FAILURES in a row.
+CACHE_BREAKER_MAX_FAILURES = 5
+CACHE_BREAKER_RESET_TIME = 10
+
+# Tokens of /sync are behind the database time by this much (in seconds),
+# so changes of the transactions running at the time aren't missed.
+SYNC_OVERLAP_TIME = 10
+SYNC_DELETED_EXPIRE_TIME = 30 * 86400
+
+# Max number of ids, that can be requested at once by the batch endpoints.
+BATCH_MAX_IDS = 100
+# Max number of the latest issues, that can be embedded into projects list.
+EMBED_ISSUES_MAX = 10
 
 SMTP_HOST = os.environ.get("SMTP_HOST")
 SMTP_PORT = os.environ.get("SMTP_PORT")
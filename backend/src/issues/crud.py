@@ -1,16 +1,31 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 
-from sqlalchemy import select, insert, update, delete
+from sqlalchemy import (
+    select, insert, update, delete,
+    literal, true, union_all
+)
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from projects.models import Project
 from utils.db import handleDbUniqueError
+from utils.batch import get_by_ids_db
+from utils.pagination import IssuesPagination, STATUS_COUNTERS, encode_cursor
+from utils.cache import (
+    Redis, cache_get_or_set_versioned, cache_get_or_set_many_versioned,
+    cache_set_versioned,
+    cache_delete_versioned, issue_namespace
+)
 from .models import Issue
-from .schemas import IssueSchema, CreatedIssueSchema
+from .schemas import (
+    IssueSchema, CreatedIssueSchema,
+    BoardColumn, BoardResponse
+)
 
 
 async def create_issue_db(
     session: AsyncSession,
+    cache: Redis,
     user_id: int,
     project_id: int,
     issue: IssueSchema
@@ -39,15 +54,40 @@ async def create_issue_db(
             )
             .returning(Issue)
         )
+        created_issue = await handleDbUniqueError(session, stmt)
 
-        return await handleDbUniqueError(session, stmt)
+        await cache_set_versioned(
+            cache,
+            issue_namespace(user_id, project_id),
+            IssueSchema.model_validate(created_issue),
+            issue_id=created_issue.id
+        )
+        return created_issue
 
 
 async def get_issue_db(
     session: AsyncSession,
+    cache: Redis,
     user_id: int,
     project_id: int,
-    issue_id
+    issue_id: int
+) -> IssueSchema | Response:
+
+    return await cache_get_or_set_versioned(
+        cache,
+        issue_namespace(user_id, project_id),
+        _get_issue_db,
+        session, user_id, project_id,
+        nx=True,
+        issue_id=issue_id
+    )
+
+
+async def _get_issue_db(
+    session: AsyncSession,
+    user_id: int,
+    project_id: int,
+    issue_id: int
 ) -> IssueSchema:
 
     query = (
@@ -67,11 +107,125 @@ async def get_issue_db(
             ("Issue not found! Make sure that the correct data is passed.")
         )
     else:
-        return issue
+        return IssueSchema.model_validate(issue)
+
+
+async def get_issues_db(
+    session: AsyncSession,
+    cache: Redis,
+    user_id: int,
+    project_id: int,
+    issue_ids: list[int]
+) -> Response:
+
+    return await cache_get_or_set_many_versioned(
+        cache,
+        issue_namespace(user_id, project_id),
+        _get_issues_db,
+        session, user_id, project_id,
+        ids=issue_ids,
+        id_param="issue_id"
+    )
+
+
+async def _get_issues_db(
+    session: AsyncSession,
+    user_id: int,
+    project_id: int,
+    issue_ids: list[int]
+) -> list[IssueSchema]:
+
+    return await get_by_ids_db(
+        session, Issue, IssueSchema, issue_ids,
+        Issue.author_id == user_id,
+        Issue.project_id == project_id
+    )
+
+
+async def get_board_db(
+    session: AsyncSession,
+    user_id: int,
+    project_id: int,
+    limit: int
+) -> BoardResponse:
+    """
+    Return the first limit issues of every status in one query.
+
+    Every status is a row of the project with its counter,
+    the issues are joined to it laterally, so each column
+    is read in order from the status index and stops after limit rows.
+    """
+    statuses = union_all(*[
+        select(
+            literal(status).label("status"),
+            counter.label("count")
+        )
+        .where(Project.author_id == user_id, Project.id == project_id)
+        for status, counter in STATUS_COUNTERS.items()
+    ]).subquery()
+
+    order = IssuesPagination._order(Issue)
+
+    # One row more tells whether there are more issues in the column.
+    items = (
+        select(Issue)
+        .where(
+            Issue.author_id == user_id,
+            Issue.project_id == project_id,
+            Issue.status == statuses.c.status
+        )
+        .order_by(*IssuesPagination._order_by(Issue))
+        .limit(limit + 1)
+        .lateral()
+    )
+
+    item = aliased(Issue, items)
+
+    query = (
+        select(statuses, item)
+        .select_from(statuses)
+        .outerjoin(items, true())
+        # Sorts only the joined rows, that are already limited.
+        .order_by(statuses.c.status, item.type, item.created, item.id)
+    )
+    rows = (await session.execute(query)).all()
+
+    if not rows:
+        raise HTTPException(404, "Project not found!")
+
+    counts = {row.status: row.count for row in rows}
+    results = {status: [] for status in STATUS_COUNTERS}
+
+    for row in rows:
+        if row[-1] is not None:
+            results[row.status].append(row[-1])
+
+    columns = []
+
+    for status, issues in results.items():
+        next_cursor = None
+
+        if len(issues) > limit:
+            issues = issues[:limit]
+            next_cursor = encode_cursor(
+                [getattr(issues[-1], column.key) for column, _ in order]
+            )
+
+        columns.append(
+            BoardColumn(
+                status=status,
+                count=counts[status],
+                next_cursor=next_cursor,
+                results=issues
+            )
+        )
+
+    return BoardResponse(columns=columns)
 
 
 async def update_issue_db(
     session: AsyncSession,
+    cache: Redis,
     user_id: int,
     project_id: int,
     issue_id: int,
@@ -96,11 +250,18 @@ async def update_issue_db(
         raise HTTPException(400, "The issue for the update doesn't exist!")
     else:
         await session.commit()
+        await cache_set_versioned(
+            cache,
+            issue_namespace(user_id, project_id),
+            IssueSchema.model_validate(updated_issue),
+            issue_id=issue_id
+        )
         return updated_issue
 
 
 async def delete_issue_db(
     session: AsyncSession,
+    cache: Redis,
     user_id: int,
     project_id: int,
     issue_id: int
@@ -125,4 +286,10 @@ async def delete_issue_db(
         )
     else:
         await session.commit()
+        await cache_delete_versioned(
+            cache,
+            issue_namespace(user_id, project_id),
+            issue_id=issue_id
+        )
         return {"result": "Success"}
+
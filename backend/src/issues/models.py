@@ -1,10 +1,15 @@
 from sqlalchemy import (
     VARCHAR, ForeignKey, Index,
-    CheckConstraint, UniqueConstraint
+    CheckConstraint, UniqueConstraint, event
 )
 from sqlalchemy.orm import Mapped, mapped_column
 
-from models import BaseClass, to_tsvector
+from models import BaseClass, create_search_vector_trigger, search_vector
+from sync.models import log_deleted_item_function, log_deleted_item_trigger
+from utils.counters import (
+    issue_counters_function,
+    issue_counters_trigger, issue_counters_update_trigger
+)
 from .schemas import IssueType, IssueStatus, IssuePriority
 
 
@@ -19,13 +24,35 @@ class Issue(BaseClass):
     type: Mapped[str] = mapped_column(VARCHAR)
     priority: Mapped[str] = mapped_column(VARCHAR)
     status: Mapped[str] = mapped_column(VARCHAR)
+    search_vector: Mapped[str] = search_vector(title="A", description="B")
 
     __table_args__ = (
         UniqueConstraint("project_id", "title", name="issue_unique_title"),
+        # Matches the changes of /sync.
+        Index("issue_sync_idx", "author_id", "updated"),
+        # Matches the issues list (see IssuesPagination).
+        Index(
+            "issue_list_idx",
+            "author_id", "project_id", "type", "created", "id"
+        ),
+        # Match the filtered and sorted issues list.
         Index(
-            "issue_fts_idx",
-            to_tsvector("title", "description"),
-            postgresql_using="gin"
+            "issue_status_idx",
+            "author_id", "project_id", "status", "type", "created", "id"
+        ),
+        Index(
+            "issue_created_idx",
+            "author_id", "project_id", "created", "id"
+        ),
+        Index(
+            "issue_updated_idx",
+            "author_id", "project_id", "updated", "id"
+        ),
+        Index("issue_fts_idx", "search_vector", postgresql_using="gin"),
+        # Matches the fuzzy search, only among the issues of the author.
+        Index(
+            "issue_title_trgm_idx", "author_id", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}
         ),
         CheckConstraint(
             sqltext=type.in_(
@@ -59,3 +86,11 @@ class Issue(BaseClass):
             name='issue_status_check'
         )
     )
+
+
+event.listen(Issue.__table__, "after_create", issue_counters_function)
+event.listen(Issue.__table__, "after_create", issue_counters_trigger)
+event.listen(Issue.__table__, "after_create", issue_counters_update_trigger)
+event.listen(Issue.__table__, "after_create", log_deleted_item_function)
+event.listen(Issue.__table__, "after_create", log_deleted_item_trigger)
+event.listen(Issue.__table__, "after_create", create_search_vector_trigger)
@@ -4,23 +4,29 @@ from fastapi import APIRouter, Depends, Path
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import REDIS_STALE_TIME
 from utils.db import get_async_session
 from utils.cache import (
     Redis, get_redis_client,
-    cache_get_or_set, cache_delete_all
+    cache_get_or_set_versioned, cache_invalidate, cache_refresh_hot,
+    projects_namespace, projects_issues_namespace,
+    issues_namespace, search_namespace
 )
 from auth.manager import User, current_active_user
 from utils.pagination import (
-    PaginatedResponse, NoItemsResponse,
-    pagination_params, IssuesPagination
+    PaginatedResponse, CursorPaginatedResponse, NoItemsResponse,
+    pagination_params, issues_filter_params, issue_fields_params,
+    is_hot_page, IssuesPagination, ProjectsPagination
 )
+from utils.batch import ids_params
 from .schemas import (
     CreateIssueSchema,  UpdateIssueSchema,
-    CreatedIssueSchema, IssueSchema
+    CreatedIssueSchema, IssueSchema, IssuesBatchResponse
 )
+from projects.models import Project
 from .models import Issue
 from .crud import (
-    create_issue_db, get_issue_db,
+    create_issue_db, get_issue_db, get_issues_db,
     update_issue_db, delete_issue_db
 )
 
@@ -35,17 +41,32 @@ router = APIRouter(
 async def get_issues(
     project_id: Annotated[int, Path(ge=1)],
     pagination_params: pagination_params,
+    filters: issues_filter_params,
+    fields: issue_fields_params,
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
     cache: Redis = Depends(get_redis_client)
-) -> PaginatedResponse | NoItemsResponse:
-    """ Return all issues related with specified project with pagination. """
+) -> PaginatedResponse | CursorPaginatedResponse | NoItemsResponse:
+    """
+    Return all issues related with specified project with pagination,
+    optionally filtered, sorted and only the comma-separated fields.
+    """
 
-    return await cache_get_or_set(
+    return await cache_get_or_set_versioned(
         cache,
-        f"issues_project_{project_id}_{pagination_params}",
+        issues_namespace(user.id, project_id),
         IssuesPagination.get_paginated,
-        session, Issue, pagination_params, user.id, project_id
+        session, Issue,
+        hot=(
+            is_hot_page(pagination_params)
+            and not filters and fields is None
+        ),
+        stale_time=REDIS_STALE_TIME,
+        pagination_params=pagination_params,
+        user_id=user.id,
+        project_id=project_id,
+        filters=filters,
+        fields=fields
     )
 
 
@@ -59,8 +80,25 @@ async def create_issue(
 ) -> CreatedIssueSchema:
     """ Create a new issue related to the specified project """
 
-    await cache_delete_all(cache, f"issues_project_{project_id}_*")
-    return await create_issue_db(session, user.id, project_id, issue)
+    created_issue = await create_issue_db(
+        session, cache, user.id, project_id, issue
+    )
+
+    await invalidate_issues_cache(cache, session, user.id, project_id)
+    return created_issue
+
+
+@router.get("/batch")
+async def get_issues_batch(
+    project_id: Annotated[int, Path(ge=1)],
+    ids: ids_params,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),
+    cache: Redis = Depends(get_redis_client)
+) -> IssuesBatchResponse:
+    """ Return issues of the project with the ids, that exist. """
+
+    return await get_issues_db(session, cache, user.id, project_id, ids)
 
 
 @router.get("/{issue_id}")
@@ -68,11 +106,12 @@ async def get_issue(
     project_id: Annotated[int, Path(ge=1)],
     issue_id: Annotated[int, Path(ge=1)],
     session: AsyncSession = Depends(get_async_session),
-    user: User = Depends(current_active_user)
+    user: User = Depends(current_active_user),
+    cache: Redis = Depends(get_redis_client)
 ) -> IssueSchema:
     """ Return an issue related to the specified project """
 
-    return await get_issue_db(session, user.id, project_id, issue_id)
+    return await get_issue_db(session, cache, user.id, project_id, issue_id)
 
 
 @router.patch("/{issue_id}")
@@ -86,8 +125,15 @@ async def update_issue(
 ) -> IssueSchema:
     """ Update an issue related to the specified project """
 
-    await cache_delete_all(cache, f"issues_project_{project_id}_*")
-    return await update_issue_db(session, user.id, project_id, issue_id, issue)
+    updated_issue = await update_issue_db(
+        session, cache, user.id, project_id, issue_id, issue
+    )
+
+    await invalidate_issues_cache(
+        cache, session, user.id, project_id,
+        issues_count_changed=False
+    )
+    return updated_issue
 
 
 @router.delete("/{issue_id}")
@@ -100,5 +146,50 @@ async def delete_issue(
 ):
     """ Delete specified issue from specified project """
 
-    await cache_delete_all(cache, f"issues_project_{project_id}_*")
-    return await delete_issue_db(session, user.id, project_id, issue_id)
+    result = await delete_issue_db(
+        session, cache, user.id, project_id, issue_id
+    )
+
+    await invalidate_issues_cache(cache, session, user.id, project_id)
+    return result
+
+
+async def invalidate_issues_cache(
+    cache: Redis,
+    session: AsyncSession,
+    user_id: int,
+    project_id: int,
+    issues_count_changed: bool = True
+):
+    """
+    Invalidate cached issues of the project, search results,
+    projects list with embedded issues (and projects list,
+    that shows issues count) after a commit
+    and warm up the hot pages of the lists in the background.
+    """
+    projects_namespaces = [projects_issues_namespace(user_id)]
+    if issues_count_changed:
+        projects_namespaces.append(projects_namespace(user_id))
+
+    await cache_invalidate(
+        cache,
+        issues_namespace(user_id, project_id),
+        search_namespace(user_id),
+        *projects_namespaces
+    )
+    cache_refresh_hot(
+        cache,
+        issues_namespace(user_id, project_id),
+        IssuesPagination.get_paginated,
+        session, Issue,
+        stale_time=REDIS_STALE_TIME
+    )
+
+    for namespace in projects_namespaces:
+        cache_refresh_hot(
+            cache,
+            namespace,
+            ProjectsPagination.get_paginated,
+            session, Project,
+            stale_time=REDIS_STALE_TIME
+        )
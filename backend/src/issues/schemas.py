@@ -3,6 +3,8 @@ from enum import Enum
 
 from pydantic import BaseModel, Field, ConfigDict
 
+from utils.schemas import SparseSchema
+
 
 class IssueType(Enum):
     bug = "Bug"
@@ -23,6 +25,14 @@ class IssueStatus(Enum):
     done = "Done"
 
 
+class IssueSort(Enum):
+    type = "type"
+    created = "created"
+    created_desc = "-created"
+    updated = "updated"
+    updated_desc = "-updated"
+
+
 class CreateIssueSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
@@ -52,10 +62,40 @@ class PaginationIssue(IssueSchema):
     pass
 
 
+class SparsePaginationIssue(SparseSchema):
+    model_config = ConfigDict(use_enum_values=True)
+
+    title: str | None = None
+    description: str | None = None
+    type: IssueType | None = None
+    priority: IssuePriority | None = None
+    status: IssueStatus | None = None
+    id: int | None = None
+    project_id: int | None = None
+    created: datetime | None = None
+    updated: datetime | None = None
+
+
 class CreatedIssueSchema(IssueSchema):
     pass
 
 
+class IssuesBatchResponse(BaseModel):
+    results: list[IssueSchema]
+
+
+class BoardColumn(BaseModel):
+    status: IssueStatus
+    count: int
+    # Pass it with the status filter to the issues list to get the rest.
+    next_cursor: str | None
+    results: list[PaginationIssue]
+
+
+class BoardResponse(BaseModel):
+    columns: list[BoardColumn]
+
+
 class SearchIssue(BaseModel):
     project_id: int
     id: int
@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from celery import Celery
 
 from fastapi import FastAPI
@@ -13,8 +16,20 @@ from auth.manager import (
 from projects.router import router as projects_router
 from issues.router import router as issues_router
 from search.router import router as search_router
+from metrics.router import router as metrics_router
+from sync.router import router as sync_router
+from utils.cache import local_cache_listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    listener = asyncio.create_task(local_cache_listener())
+    yield
+    listener.cancel()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     root_path="/api",
     title="BugTracker",
     contact={
@@ -52,6 +67,8 @@ celery.autodiscover_tasks()
 app.include_router(projects_router)
 app.include_router(issues_router)
 app.include_router(search_router)
+app.include_router(metrics_router)
+app.include_router(sync_router)
 
 
 app.include_router(
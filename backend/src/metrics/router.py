@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+from auth.manager import User, current_superuser
+from utils.metrics import counters
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+
+@router.get("")
+async def metrics(
+    user: User = Depends(current_superuser)
+) -> dict[str, int | float]:
+    """
+    Return counters of the worker that handled the request
+    with the hit ratio of every counted cache.
+    """
+    results = dict(counters)
+
+    for name, hits in counters.items():
+        label = name.removesuffix("_hits")
+
+        # E.g. cache_stale_hits have no misses, they are a part of hits.
+        if label != name and f"{label}_misses" in counters:
+            misses = counters[f"{label}_misses"]
+            results[f"{label}_hit_ratio"] = hits / (hits + misses)
+
+    return results
@@ -1,6 +1,9 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, func, text, literal
+from sqlalchemy import (
+    DDL, Connection, DateTime, FetchedValue, ForeignKey, Table, event, text
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from utils.db import Base, intpk
@@ -23,21 +26,87 @@ class BaseClass(Base):
     )
 
 
-def to_tsvector(*columns: str, regconfig: str = None):
+def search_vector(**weights: str):
     """
-    Return to_tsvector postgresql function for specified columns.
+    Return tsvector column of the columns with weights,
+    e.g. search_vector(title="A", description="B").
+
+    It is kept by a trigger (see create_search_vector_trigger), not generated,
+    so the expression can be changed without rewriting the table.
+    It isn't loaded with the model, as it's only for searching.
+    """
+    return mapped_column(
+        TSVECTOR,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        deferred=True,
+        info={"search_weights": weights}
+    )
 
-    For some reason, asyncpg doesn't want to create an index
-    if you pass REGCONFIG strings without literal().
-    But if you use literal() for both index creation and search,
-    the search will no longer work.
 
-    Therefore, when creating an index (for example, for a test db),
-    literal('english') is used, otherwise without literal().
+def search_vector_expression(row: str = "", **weights: str) -> str:
     """
-    string = " || ' ' || ".join(columns)
+    Return the search vector of the columns with weights of the row.
 
-    return func.to_tsvector(
-        regconfig if regconfig else literal('english'),
-        text(string)
+    The text configuration is picked by search_language
+    from all the columns, so a row is stemmed in its language.
+    NULLs are read as empty strings, so a row with a NULL column
+    is still searchable by the other ones.
+    """
+    texts = [f"coalesce({row}{column}, '')" for column in weights]
+    language = "search_language(" + " || ' ' || ".join(texts) + ")"
+
+    return " || ".join(
+        f"setweight(to_tsvector({language}, {text}), '{weight}')"
+        for text, weight in zip(texts, weights.values())
     )
+
+
+def create_search_vector_trigger(table: Table, connection: Connection, **kw):
+    """ Create the trigger, that keeps search_vector of the table. """
+    weights = table.c.search_vector.info["search_weights"]
+
+    connection.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {table.name}_search_vector()
+        RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {search_vector_expression("NEW.", **weights)};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    connection.execute(text(f"""
+        CREATE TRIGGER {table.name}_search_vector
+        BEFORE INSERT OR UPDATE OF {", ".join(weights)} ON {table.name}
+        FOR EACH ROW EXECUTE FUNCTION {table.name}_search_vector()
+    """))
+
+
+# Text search configuration for the text: russian for texts with Cyrillic
+# (it stems English words as english does), english for other texts
+# with Latin letters and simple for the rest.
+# Search vectors and queries use it, so they are parsed the same way.
+search_language_function = DDL("""
+    CREATE OR REPLACE FUNCTION search_language(text) RETURNS regconfig AS $$
+        SELECT CASE
+            WHEN $1 ~ '[а-яёА-ЯЁ]' THEN 'russian'::regconfig
+            WHEN $1 ~ '[a-zA-Z]' THEN 'english'::regconfig
+            ELSE 'simple'::regconfig
+        END
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE
+""")
+
+# Search vectors of the tables are computed by it.
+event.listen(Base.metadata, "before_create", search_language_function)
+
+# Trigram indexes of the fuzzy search need them, btree_gin for author_id.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gin")
+)
@@ -1,17 +1,24 @@
 import re
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 
 from sqlalchemy import select, insert, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from utils.db import handleDbUniqueError
+from utils.batch import get_by_ids_db
+from utils.cache import (
+    Redis, cache_get_or_set, cache_get_or_set_many,
+    cache_set, cache_delete, cache_invalidate,
+    project_key, issue_namespace
+)
 from .schemas import ProjectSchema, CreatedProjectSchema, UpdateProjectSchema
 from .models import Project
 
 
 async def create_project_db(
     session: AsyncSession,
+    cache: Redis,
     user_id: int,
     project: ProjectSchema
 ) -> CreatedProjectSchema:
@@ -23,10 +30,33 @@ async def create_project_db(
         .values(**project.model_dump(), author_id=user_id)
         .returning(Project)
     )
-    return await handleDbUniqueError(session, stmt)
+    created_project = await handleDbUniqueError(session, stmt)
+
+    await cache_set(
+        cache,
+        project_key(user_id, created_project.id),
+        ProjectSchema.model_validate(created_project)
+    )
+    return created_project
 
 
 async def get_project_db(
+    session: AsyncSession,
+    cache: Redis,
+    user_id: int,
+    project_id: int
+) -> ProjectSchema | Response:
+
+    return await cache_get_or_set(
+        cache,
+        project_key(user_id, project_id),
+        _get_project_db,
+        session, user_id, project_id,
+        nx=True
+    )
+
+
+async def _get_project_db(
     session: AsyncSession,
     user_id: int,
     project_id: int
@@ -41,11 +71,39 @@ async def get_project_db(
     if project is None:
         raise HTTPException(404, "Project not found!")
     else:
-        return project
+        return ProjectSchema.model_validate(project)
+
+
+async def get_projects_db(
+    session: AsyncSession,
+    cache: Redis,
+    user_id: int,
+    project_ids: list[int]
+) -> Response:
+
+    return await cache_get_or_set_many(
+        cache,
+        {id: project_key(user_id, id) for id in project_ids},
+        _get_projects_db,
+        session, user_id
+    )
+
+
+async def _get_projects_db(
+    session: AsyncSession,
+    user_id: int,
+    project_ids: list[int]
+) -> list[ProjectSchema]:
+
+    return await get_by_ids_db(
+        session, Project, ProjectSchema, project_ids,
+        Project.author_id == user_id
+    )
 
 
 async def update_project_db(
     session: AsyncSession,
+    cache: Redis,
     user_id: int,
     project_id: int,
     project: UpdateProjectSchema
@@ -68,11 +126,17 @@ async def update_project_db(
         raise HTTPException(400, "The project for the update doesn't exist!")
     else:
         await session.commit()
+        await cache_set(
+            cache,
+            project_key(user_id, project_id),
+            ProjectSchema.model_validate(updated_project)
+        )
         return updated_project
 
 
 async def delete_project_db(
     session: AsyncSession,
+    cache: Redis,
     user_id: int,
     project_id: int
 ) -> dict[str, str]:
@@ -89,6 +153,9 @@ async def delete_project_db(
         raise HTTPException(400, "The project to delete doesn't exist!")
     else:
         await session.commit()
+        # Issues of the project are deleted by cascade, so are cached ones.
+        await cache_delete(cache, project_key(user_id, project_id))
+        await cache_invalidate(cache, issue_namespace(user_id, project_id))
         return {"results": "Success"}
 
 
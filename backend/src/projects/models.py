@@ -1,7 +1,12 @@
-from sqlalchemy import Index, VARCHAR, UniqueConstraint
+from sqlalchemy import Index, VARCHAR, UniqueConstraint, event
 from sqlalchemy.orm import Mapped, mapped_column
 
-from models import BaseClass, to_tsvector
+from models import BaseClass, create_search_vector_trigger, search_vector
+from utils.db import counter
+from sync.models import log_deleted_item_function, log_deleted_item_trigger
+from utils.counters import (
+    project_counters_function, project_counters_trigger
+)
 
 
 class Project(BaseClass):
@@ -10,8 +15,36 @@ class Project(BaseClass):
     name: Mapped[str] = mapped_column(VARCHAR(255))
     key: Mapped[str] = mapped_column(VARCHAR(10))
     favorite: Mapped[bool | None] = mapped_column(default=False)
+    issues_count: Mapped[counter]
+    to_do_count: Mapped[counter]
+    in_progress_count: Mapped[counter]
+    done_count: Mapped[counter]
+    search_vector: Mapped[str] = search_vector(name="A", key="B")
 
     __table_args__ = (
         UniqueConstraint("author_id", "key", name="project_unique_key"),
-        Index("project_fts_idx", to_tsvector("name", "key"), postgresql_using="gin")
+        # Matches the changes of /sync.
+        Index("project_sync_idx", "author_id", "updated"),
+        # Matches the projects list (see ProjectsPagination).
+        Index(
+            "project_list_idx",
+            "author_id", favorite.desc(), "created", "id"
+        ),
+        Index("project_fts_idx", "search_vector", postgresql_using="gin"),
+        # Match the fuzzy search, only among the projects of the author.
+        Index(
+            "project_name_trgm_idx", "author_id", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ),
+        Index(
+            "project_key_trgm_idx", "author_id", "key",
+            postgresql_using="gin", postgresql_ops={"key": "gin_trgm_ops"}
+        )
     )
+
+
+event.listen(Project.__table__, "after_create", project_counters_function)
+event.listen(Project.__table__, "after_create", project_counters_trigger)
+event.listen(Project.__table__, "after_create", log_deleted_item_function)
+event.listen(Project.__table__, "after_create", log_deleted_item_trigger)
+event.listen(Project.__table__, "after_create", create_search_vector_trigger)
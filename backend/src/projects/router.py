@@ -1,27 +1,34 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Query
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import REDIS_STALE_TIME, EMBED_ISSUES_MAX
 from auth.manager import User, current_active_user
 from utils.db import get_async_session
 from utils.cache import (
     Redis, get_redis_client,
-    cache_get_or_set, cache_delete_all
+    cache_get_or_set_versioned, cache_invalidate, cache_refresh_hot,
+    projects_namespace, projects_issues_namespace,
+    issues_namespace, search_namespace
 )
 from utils.pagination import (
-    PaginatedResponse, NoItemsResponse,
-    pagination_params, ProjectsPagination
+    PaginatedResponse, CursorPaginatedResponse, NoItemsResponse,
+    pagination_params, project_fields_params,
+    is_hot_page, ProjectsPagination
 )
+from utils.batch import ids_params
+from issues.schemas import BoardResponse
+from issues.crud import get_board_db
 from .schemas import (
     CreateProjectSchema,
     ProjectSchema, CreatedProjectSchema,
-    UpdateProjectSchema
+    UpdateProjectSchema, ProjectsBatchResponse
 )
 from .models import Project
 from .crud import (
-    get_project_db, create_project_db,
+    get_project_db, get_projects_db, create_project_db,
     update_project_db, delete_project_db
 )
 
@@ -35,17 +42,34 @@ router = APIRouter(
 @router.get("")
 async def projects(
     pagination_params: pagination_params,
+    fields: project_fields_params,
+    embed_issues: Annotated[int, Query(ge=0, le=EMBED_ISSUES_MAX)] = 0,
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
     cache: Redis = Depends(get_redis_client)
-) -> PaginatedResponse | NoItemsResponse:
-    """ Return all user projects with pagination. """
-
-    return await cache_get_or_set(
+) -> PaginatedResponse | CursorPaginatedResponse | NoItemsResponse:
+    """
+    Return all user projects with pagination,
+    optionally only the comma-separated fields
+    or with up to embed_issues latest issues of every project.
+    """
+    if embed_issues:
+        # It changes with issues, unlike the plain list.
+        namespace = projects_issues_namespace(user.id)
+    else:
+        namespace = projects_namespace(user.id)
+
+    return await cache_get_or_set_versioned(
         cache,
-        f"projects_{user.id}_{pagination_params}",
+        namespace,
         ProjectsPagination.get_paginated,
-        session, Project, pagination_params, user.id
+        session, Project,
+        hot=is_hot_page(pagination_params) and fields is None,
+        stale_time=REDIS_STALE_TIME,
+        pagination_params=pagination_params,
+        user_id=user.id,
+        fields=fields,
+        embed=embed_issues
     )
 
 
@@ -58,19 +82,58 @@ async def create_project(
 ) -> CreatedProjectSchema:
     """ Create a new project. """
 
-    await cache_delete_all(cache, f"projects_{user.id}_*")
-    return await create_project_db(session, user.id, project)
+    created_project = await create_project_db(
+        session, cache, user.id, project
+    )
+
+    await invalidate_projects_cache(cache, session, user.id)
+    return created_project
+
+
+@router.get("/batch")
+async def get_projects(
+    ids: ids_params,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),
+    cache: Redis = Depends(get_redis_client)
+) -> ProjectsBatchResponse:
+    """ Return projects with the ids, that exist, in one request. """
+
+    return await get_projects_db(session, cache, user.id, ids)
 
 
 @router.get("/{project_id}")
 async def get_project(
     project_id: Annotated[int, Path(ge=1)],
     session: AsyncSession = Depends(get_async_session),
-    user: User = Depends(current_active_user)
+    user: User = Depends(current_active_user),
+    cache: Redis = Depends(get_redis_client)
 ) -> ProjectSchema:
     """ Return specified project. """
 
-    return await get_project_db(session, user.id, project_id)
+    return await get_project_db(session, cache, user.id, project_id)
+
+
+@router.get("/{project_id}/board")
+async def get_board(
+    project_id: Annotated[int, Path(ge=1)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),
+    cache: Redis = Depends(get_redis_client)
+) -> BoardResponse:
+    """ Return the project issues grouped by status, limit per status. """
+
+    return await cache_get_or_set_versioned(
+        cache,
+        issues_namespace(user.id, project_id),
+        get_board_db,
+        session,
+        stale_time=REDIS_STALE_TIME,
+        user_id=user.id,
+        project_id=project_id,
+        limit=limit
+    )
 
 
 @router.patch("/{project_id}")
@@ -83,8 +146,12 @@ async def update_project(
 ) -> ProjectSchema:
     """ Update already exists project via PATCH request. """
 
-    await cache_delete_all(cache, f"projects_{user.id}_*")
-    return await update_project_db(session, user.id, project_id, project)
+    updated_project = await update_project_db(
+        session, cache, user.id, project_id, project
+    )
+
+    await invalidate_projects_cache(cache, session, user.id)
+    return updated_project
 
 
 @router.delete("/{project_id}")
@@ -96,5 +163,40 @@ async def delete_project(
 ) -> dict[str, str]:
     """ Delete specified project. """
 
-    await cache_delete_all(cache, f"projects_{user.id}_*")
-    return await delete_project_db(session, user.id, project_id)
+    result = await delete_project_db(session, cache, user.id, project_id)
+
+    await invalidate_projects_cache(
+        cache, session, user.id,
+        issues_namespace(user.id, project_id)
+    )
+    return result
+
+
+async def invalidate_projects_cache(
+    cache: Redis,
+    session: AsyncSession,
+    user_id: int,
+    *namespaces: str
+):
+    """
+    Invalidate cached projects, search results (and other namespaces)
+    after a commit
+    and warm up the hot pages of the projects lists in the background.
+    """
+    await cache_invalidate(
+        cache,
+        projects_namespace(user_id),
+        projects_issues_namespace(user_id),
+        search_namespace(user_id),
+        *namespaces
+    )
+    for namespace in (
+        projects_namespace(user_id), projects_issues_namespace(user_id)
+    ):
+        cache_refresh_hot(
+            cache,
+            namespace,
+            ProjectsPagination.get_paginated,
+            session, Project,
+            stale_time=REDIS_STALE_TIME
+        )
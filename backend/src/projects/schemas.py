@@ -2,6 +2,9 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field, ConfigDict
 
+from utils.schemas import SparseSchema
+from issues.schemas import PaginationIssue
+
 
 class CreateProjectSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
@@ -24,13 +27,32 @@ class ProjectSchema(CreateProjectSchema):
 
 
 class PaginationProject(ProjectSchema):
-    pass
+    issues_count: int
+
+
+class EmbeddedPaginationProject(PaginationProject):
+    # The latest ones, see embed_issues of the projects list.
+    issues: list[PaginationIssue]
+
+
+class SparsePaginationProject(SparseSchema):
+    name: str | None = None
+    key: str | None = None
+    favorite: bool | None = None
+    id: int | None = None
+    created: datetime | None = None
+    updated: datetime | None = None
+    issues_count: int | None = None
 
 
 class CreatedProjectSchema(ProjectSchema):
     pass
 
 
+class ProjectsBatchResponse(BaseModel):
+    results: list[ProjectSchema]
+
+
 class SearchProject(BaseModel):
     id: int
     name: str
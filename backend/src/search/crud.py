@@ -1,45 +1,242 @@
-from sqlalchemy import select, func
+import re
+
+from sqlalchemy import (
+    select, func, cast, literal, null, true, or_, union_all,
+    INTEGER, REAL, VARCHAR
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from projects.models import Project
 from issues.models import Issue
-from models import to_tsvector
-from .schemas import SearchResultsResponse, NoItemsResponse
+from utils.pagination import encode_cursor, decode_cursor, keyset_condition
+from .schemas import SearchResultsResponse, NoItemsResponse, SearchMode
+
+
+# Columns of the search statement rows, see search_statement.
+SEARCH_COLUMNS = {
+    "id": INTEGER,
+    "project_id": INTEGER,
+    "name": VARCHAR,
+    "key": VARCHAR,
+    "title": VARCHAR
+}
+PROJECT_COLUMNS = {"id": Project.id, "name": Project.name, "key": Project.key}
+ISSUE_COLUMNS = {
+    "id": Issue.id,
+    "project_id": Issue.project_id,
+    "title": Issue.title
+}
+# Columns of the fuzzy search, they have trigram indexes with author_id.
+PROJECT_FUZZY_COLUMNS = (Project.name, Project.key)
+ISSUE_FUZZY_COLUMNS = (Issue.title,)
 
 
 async def fulltext_search(
-    q: str,
     session: AsyncSession,
-    user_id: int
+    q: str,
+    user_id: int,
+    limit: int = 10,
+    projects_cursor: str | None = None,
+    issues_cursor: str | None = None,
+    mode: str = SearchMode.words.value
 ) -> SearchResultsResponse | NoItemsResponse:
+    """
+    Return up to limit the most relevant projects and issues for q,
+    each after its cursor (see next_cursor of the section).
+    """
+    query = search_statement(
+        q, user_id, limit, projects_cursor, issues_cursor, mode
+    )
+    rows = (await session.execute(query)).mappings().all()
 
-    projects_query = (
-        select(Project.id, Project.name, Project.key)
-        .where(
-            Project.author_id == user_id,
-            to_tsvector("name", "key", regconfig="english").bool_op("@@")(
-                func.plainto_tsquery("english", q)
-            )
+    projects, projects_next_cursor = _section_results(
+        rows, "project", limit
+    )
+    issues, issues_next_cursor = _section_results(rows, "issue", limit)
+
+    if (
+        not projects and not issues
+        and projects_cursor is None and issues_cursor is None
+    ):
+        return NoItemsResponse(detail="No results")
+
+    return SearchResultsResponse(
+        projects=projects,
+        issues=issues,
+        projects_has_more=projects_next_cursor is not None,
+        issues_has_more=issues_next_cursor is not None,
+        projects_next_cursor=projects_next_cursor,
+        issues_next_cursor=issues_next_cursor
+    )
+
+
+def search_statement(
+    q: str,
+    user_id: int,
+    limit: int,
+    projects_cursor: str | None = None,
+    issues_cursor: str | None = None,
+    mode: str = SearchMode.words.value
+):
+    """
+    Return single statement for both sections of the search results.
+
+    The sections are UNION ALL-ed with the section column
+    telling them apart.
+    """
+    if mode == SearchMode.fuzzy.value:
+        projects = _fuzzy_section(
+            Project, "project", PROJECT_COLUMNS, PROJECT_FUZZY_COLUMNS,
+            q, user_id, limit, projects_cursor
+        )
+        issues = _fuzzy_section(
+            Issue, "issue", ISSUE_COLUMNS, ISSUE_FUZZY_COLUMNS,
+            q, user_id, limit, issues_cursor
         )
+    else:
+        # The tsquery is parsed once for both sections.
+        tsquery = _tsquery(q, mode)
+        projects = _fulltext_section(
+            Project, "project", PROJECT_COLUMNS,
+            tsquery, user_id, limit, projects_cursor
+        )
+        issues = _fulltext_section(
+            Issue, "issue", ISSUE_COLUMNS,
+            tsquery, user_id, limit, issues_cursor
+        )
+
+    query = union_all(projects, issues)
+    columns = query.selected_columns
+
+    # The sections are split by the section column, so their rows
+    # must come out in order. There are at most 2 * (limit + 1) of them.
+    return query.order_by(columns.section, columns.rank.desc(), columns.id)
+
+
+def _tsquery(q: str, mode: str = SearchMode.words.value):
+    # The language of q, search vectors are in the language of the row.
+    language = func.search_language(q)
+
+    if mode == SearchMode.prefix.value:
+        tsquery = func.to_tsquery(language, prefix_tsquery(q))
+    else:
+        tsquery = func.plainto_tsquery(language, q)
+
+    return select(tsquery.label("tsquery")).cte("search_query")
+
+
+def prefix_tsquery(q: str) -> str:
+    """
+    Return to_tsquery text, that matches rows with words
+    starting with every word of q, e.g. 'bug':* & 'tra':* for "bug tra".
+    """
+    return " & ".join(f"'{word}':*" for word in re.findall(r"\w+", q))
+
+
+def _fulltext_section(
+    model: Project | Issue,
+    section: str,
+    columns: dict,
+    tsquery,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None
+):
+    """ Return _section_statement ranked by ts_rank_cd. """
+    return _section_statement(
+        model, section, columns,
+        model.search_vector.bool_op("@@")(tsquery.c.tsquery),
+        func.ts_rank_cd(model.search_vector, tsquery.c.tsquery, type_=REAL),
+        user_id, limit, cursor
+    ).join(tsquery, true())
+
+
+def _fuzzy_section(
+    model: Project | Issue,
+    section: str,
+    columns: dict,
+    fuzzy_columns: tuple,
+    q: str,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None
+):
+    """
+    Return _section_statement of the rows, that have a word similar to q
+    in any of fuzzy_columns, ranked by the most similar one.
+    """
+    return _section_statement(
+        model, section, columns,
+        # Same as q <% column, but the column is where the index expects.
+        or_(*[column.op("%>")(q) for column in fuzzy_columns]),
+        func.greatest(
+            *[func.word_similarity(q, column) for column in fuzzy_columns],
+            type_=REAL
+        ),
+        user_id, limit, cursor
     )
-    projects_results = await session.execute(projects_query)
-
-    issues_query = (
-        select(Issue.project_id, Issue.id, Issue.title)
-        .where(
-            Issue.author_id == user_id,
-            to_tsvector("title", "description", regconfig="english").bool_op("@@")(
-                func.plainto_tsquery("english", q)
-            )
+
+
+def _section_statement(
+    model: Project | Issue,
+    section: str,
+    columns: dict,
+    match,
+    rank,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None
+):
+    """
+    Return statement for rows of the user, that match,
+    the most relevant by rank first and the older ones
+    among equally relevant.
+
+    All the sections select the same SEARCH_COLUMNS,
+    the ones a section doesn't have are NULL.
+    """
+    order = ((rank, True), (model.id, False))
+
+    # One row more tells whether there are more results.
+    query = (
+        select(
+            literal(section).label("section"),
+            *[
+                columns.get(name, cast(null(), type_)).label(name)
+                for name, type_ in SEARCH_COLUMNS.items()
+            ],
+            rank.label("rank")
         )
+        .select_from(model)
+        .where(model.author_id == user_id, match)
+        .order_by(rank.desc(), model.id)
+        .limit(limit + 1)
     )
-    issues_results = await session.execute(issues_query)
+    if cursor is not None:
+        query = query.where(
+            keyset_condition(order, decode_cursor(cursor, order))
+        )
+    return query
 
-    results = {
-        "projects": projects_results.mappings().fetchall(),
-        "issues": issues_results.mappings().fetchall()
-    }
 
-    if not results["projects"] and not results["issues"]:
-        return NoItemsResponse(detail="No results")
-    return results
+def _section_results(
+    rows: list,
+    section: str,
+    limit: int
+) -> tuple[list, str | None]:
+    """
+    Return rows of the section and the cursor of its next rows,
+    if there are any.
+    """
+    rows = [row for row in rows if row["section"] == section]
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1]["rank"], rows[-1]["id"]])
+
+
+def normalize_query(q: str) -> str:
+    """ Return q in the form, that is used in the search cache key. """
+    return " ".join(q.lower().split())
@@ -6,8 +6,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.manager import User, current_active_user
 from utils.db import get_async_session
-from .schemas import SearchResultsResponse, NoItemsResponse
-from .crud import fulltext_search
+from utils.cache import (
+    Redis, get_redis_client,
+    cache_get_or_set_versioned, search_namespace
+)
+from .schemas import SearchResultsResponse, NoItemsResponse, SearchMode
+from .crud import fulltext_search, normalize_query
 
 
 router = APIRouter(
@@ -19,8 +23,31 @@ router = APIRouter(
 @router.get("")
 async def search(
     q: Annotated[str, Query(min_length=3, max_length=50)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+    projects_cursor: str | None = None,
+    issues_cursor: str | None = None,
+    mode: SearchMode = SearchMode.words,
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
+    cache: Redis = Depends(get_redis_client)
 ) -> SearchResultsResponse | NoItemsResponse:
-    """ Return fulltext search results for q. """
-    return await fulltext_search(q=q, session=session, user_id=user.id)
+    """
+    Return fulltext search results for q, the most relevant first,
+    up to limit for projects and issues each.
+    With prefix mode words of q can be incomplete (for typeahead),
+    with fuzzy mode they can have typos.
+    """
+
+    return await cache_get_or_set_versioned(
+        cache,
+        search_namespace(user.id),
+        fulltext_search,
+        session,
+        label="search_cache",
+        q=normalize_query(q),
+        user_id=user.id,
+        limit=limit,
+        projects_cursor=projects_cursor,
+        issues_cursor=issues_cursor,
+        mode=mode.value
+    )
@@ -1,14 +1,30 @@
+from enum import Enum
+
 from pydantic import BaseModel
 
 from projects.schemas import SearchProject
 from issues.schemas import SearchIssue
 
 
+class SearchMode(Enum):
+    # Whole words, as in plainto_tsquery.
+    words = "words"
+    # Words of q are prefixes, for typeahead.
+    prefix = "prefix"
+    # Similar words of names, keys and titles, for typos.
+    fuzzy = "fuzzy"
+
+
 class SearchResultsResponse(BaseModel):
     """ Response schema with search results. """
 
     projects: list[SearchProject] | list[None]
     issues: list[SearchIssue] | list[None]
+    # Pass next cursor of a section to get its next results.
+    projects_has_more: bool
+    issues_has_more: bool
+    projects_next_cursor: str | None
+    issues_next_cursor: str | None
 
 
 class NoItemsResponse(BaseModel):
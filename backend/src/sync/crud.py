@@ -0,0 +1,111 @@
+import asyncio
+
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+from sqlalchemy import select, func, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import SYNC_OVERLAP_TIME, SYNC_DELETED_EXPIRE_TIME
+from projects.models import Project
+from issues.models import Issue
+from utils.pagination import encode_cursor, decode_cursor
+from .models import DeletedItem
+from .schemas import SyncResponse
+
+
+async def get_changes_db(
+    session: AsyncSession,
+    user_id: int,
+    token: str | None = None
+) -> SyncResponse:
+    """
+    Return projects and issues created or updated since the token
+    and ids of the deleted ones. Without token return everything.
+
+    The new token is behind the database time by SYNC_OVERLAP_TIME,
+    so the rows of transactions, that were still running, aren't missed.
+    Hence the items changed within that time are returned twice.
+    """
+    now = await session.scalar(select(func.now()))
+    since = None
+
+    if token is not None:
+        since, = decode_cursor(token, ((DeletedItem.deleted, False),))
+
+        if since < now - timedelta(seconds=SYNC_DELETED_EXPIRE_TIME):
+            raise HTTPException(
+                410,
+                "The token is expired, sync without it!"
+            )
+
+    projects = await session.scalars(
+        _changed(Project, user_id, since).order_by(Project.id)
+    )
+    issues = await session.scalars(
+        _changed(Issue, user_id, since).order_by(Issue.id)
+    )
+
+    deleted = {"project": [], "issue": []}
+
+    if since is not None:
+        deleted_items = await session.execute(
+            select(DeletedItem.item_type, DeletedItem.item_id)
+            .where(
+                DeletedItem.author_id == user_id,
+                DeletedItem.deleted > since
+            )
+            .order_by(DeletedItem.id)
+        )
+        for item_type, item_id in deleted_items:
+            deleted[item_type].append(item_id)
+
+    return SyncResponse(
+        token=encode_cursor([now - timedelta(seconds=SYNC_OVERLAP_TIME)]),
+        projects=projects.all(),
+        issues=issues.all(),
+        deleted_projects=deleted["project"],
+        deleted_issues=deleted["issue"]
+    )
+
+
+def _changed(model: Project | Issue, user_id: int, since: datetime | None):
+    query = select(model).where(model.author_id == user_id)
+
+    if since is not None:
+        query = query.where(model.updated > since)
+    return query
+
+
+async def purge_deleted_items(session: AsyncSession) -> int:
+    """
+    Delete the tombstones, that no valid token can ask for.
+    Run it periodically with:
+
+        cd src && python -m sync.crud
+    """
+
+    result = await session.execute(
+        delete(DeletedItem)
+        .where(
+            DeletedItem.deleted < (
+                func.now() - timedelta(seconds=SYNC_DELETED_EXPIRE_TIME)
+            )
+        )
+    )
+    await session.commit()
+    return result.rowcount
+
+
+async def main():
+    from utils.db import async_session_maker
+
+    async with async_session_maker() as session:
+        deleted = await purge_deleted_items(session)
+
+    print(f"Purged {deleted} deleted items.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
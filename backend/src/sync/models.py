@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import DDL, VARCHAR, DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from utils.db import Base, intpk
+
+
+class DeletedItem(Base):
+    """ Tombstone of a deleted project or issue (see /sync). """
+
+    __tablename__ = "deleted_item"
+
+    id: Mapped[intpk]
+    # No foreign key, the tombstones outlive the rows they refer to.
+    author_id: Mapped[int]
+    item_type: Mapped[str] = mapped_column(VARCHAR(10))
+    item_id: Mapped[int]
+    deleted: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+
+    __table_args__ = (
+        Index("deleted_item_author_idx", "author_id", "deleted"),
+    )
+
+
+log_deleted_item_function = DDL("""
+CREATE OR REPLACE FUNCTION log_deleted_item() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO deleted_item (author_id, item_type, item_id)
+    VALUES (OLD.author_id, TG_TABLE_NAME, OLD.id);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""")
+
+
+# Attached to the project and issue tables.
+log_deleted_item_trigger = DDL("""
+CREATE TRIGGER %(table)s_log_deleted
+AFTER DELETE ON %(table)s
+FOR EACH ROW EXECUTE FUNCTION log_deleted_item()
+""")
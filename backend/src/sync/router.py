@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.manager import User, current_active_user
+from utils.db import get_async_session
+from .schemas import SyncResponse
+from .crud import get_changes_db
+
+
+router = APIRouter(
+    prefix="/sync",
+    tags=["Sync"]
+)
+
+
+@router.get("")
+async def sync(
+    since: str | None = None,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user)
+) -> SyncResponse:
+    """
+    Return changes of the user projects and issues since the token
+    of the previous response (everything without it).
+    """
+
+    return await get_changes_db(session, user.id, since)
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+from projects.schemas import PaginationProject
+from issues.schemas import PaginationIssue
+
+
+class SyncResponse(BaseModel):
+    """
+    Response schema with the changes since the passed token.
+    Pass the new token to the next request.
+    """
+
+    token: str
+    projects: list[PaginationProject]
+    issues: list[PaginationIssue]
+    deleted_projects: list[int]
+    deleted_issues: list[int]
@@ -1,5 +1,7 @@
 import httpx
 
+from sync import crud as sync_crud
+
 
 async def test_pagination_zero_projects(user_client: httpx.AsyncClient):
     r = await user_client.get("projects")
@@ -115,6 +117,61 @@ async def test_get_projects(user_client: httpx.AsyncClient):
     assert r.status_code == 200
 
 
+async def test_get_projects_cursor(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects?limit=100")
+    expected = [project["id"] for project in r.json()["results"]]
+
+    ids, cursor = [], ""
+    while cursor is not None:
+        r = await user_client.get("projects", params={
+            "cursor": cursor,
+            "limit": 1
+        })
+        assert r.status_code == 200
+
+        ids += [project["id"] for project in r.json()["results"]]
+        cursor = r.json()["next_cursor"]
+
+    assert ids == expected
+
+
+async def test_get_projects_invalid_cursor(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects?cursor=invalid")
+
+    assert r.json()["detail"] == "Invalid cursor!"
+    assert r.status_code == 400
+
+
+async def test_get_projects_fields(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects?fields=id,name")
+
+    assert r.status_code == 200
+    assert all(set(p) == {"id", "name"} for p in r.json()["results"])
+
+
+async def test_get_projects_unknown_fields(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects?fields=id,author_id")
+
+    assert r.json()["detail"] == "Unknown fields: author_id!"
+    assert r.status_code == 400
+
+
+async def test_get_projects_embedded_issues(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects?embed_issues=5")
+
+    assert r.status_code == 200
+    assert all(p["issues"] == [] for p in r.json()["results"])
+
+
+async def test_get_projects_embedded_issues_fields(
+    user_client: httpx.AsyncClient
+):
+    r = await user_client.get("projects?embed_issues=5&fields=id")
+
+    assert r.json()["detail"] == "Fields can't be used with embedding!"
+    assert r.status_code == 400
+
+
 async def test_get_not_exist_project(user_client: httpx.AsyncClient):
     r = await user_client.get("projects/999")
 
@@ -127,6 +184,31 @@ async def test_update_project(user_client: httpx.AsyncClient):
     assert r.status_code == 200
 
 
+async def test_get_updated_project(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/1")
+
+    assert r.json()["favorite"] is True
+    assert r.status_code == 200
+
+
+async def test_get_projects_batch(user_client: httpx.AsyncClient):
+    # The second request is served from the cache.
+    for _ in range(2):
+        r = await user_client.get("projects/batch?ids=2&ids=999&ids=1")
+        results = r.json()["results"]
+
+        assert [project["id"] for project in results] == [2, 1]
+        assert results[1]["favorite"] is True
+        assert r.status_code == 200
+
+
+async def test_get_projects_batch_too_many_ids(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/batch", params={
+        "ids": list(range(1, 102))
+    })
+    assert r.status_code == 422
+
+
 async def test_update_project_exist_key(user_client: httpx.AsyncClient):
     r = await user_client.patch("projects/2", json={"key": "test_key"})
 
@@ -220,6 +302,107 @@ async def test_get_issues(user_client: httpx.AsyncClient):
     assert r.status_code == 200
 
 
+async def test_get_issues_cursor(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/1/issues?limit=100")
+    expected = [issue["id"] for issue in r.json()["results"]]
+
+    ids, cursor = [], ""
+    while cursor is not None:
+        r = await user_client.get("projects/1/issues", params={
+            "cursor": cursor,
+            "limit": 1
+        })
+        assert r.status_code == 200
+
+        ids += [issue["id"] for issue in r.json()["results"]]
+        cursor = r.json()["next_cursor"]
+
+    assert ids == expected
+
+
+async def test_get_issues_count(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/1/issues")
+    assert r.json()["count"] == 2
+
+    r = await user_client.get("projects?limit=100")
+    project = next(p for p in r.json()["results"] if p["id"] == 1)
+
+    assert project["issues_count"] == 2
+
+
+async def test_get_issues_filtered(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/1/issues?priority=Highest&type=Bug")
+
+    assert r.json()["count"] == 1
+    assert r.json()["results"][0]["title"] == "Test issue"
+
+    r = await user_client.get("projects/1/issues?status=To do&status=Done")
+    assert r.json()["count"] == 2
+
+    r = await user_client.get("projects/1/issues?status=Done")
+    assert r.json()["results"] == "No items match the filters!"
+
+
+async def test_get_issues_sorted(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/1/issues?sort=-created")
+    ids = [issue["id"] for issue in r.json()["results"]]
+
+    assert ids == sorted(ids, reverse=True)
+
+
+async def test_get_issues_invalid_sort(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/1/issues?sort=title")
+    assert r.status_code == 422
+
+
+async def test_get_issues_fields(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/1/issues", params={
+        "fields": "title,status",
+        "cursor": "",
+        "limit": 1
+    })
+
+    results = r.json()["results"]
+
+    assert results == [{"title": "Test issue", "status": "To do"}]
+    assert r.json()["next_cursor"] is not None
+
+
+async def test_get_projects_embedded_issues_after_create(
+    user_client: httpx.AsyncClient
+):
+    r = await user_client.get("projects?embed_issues=1&limit=100")
+    project = next(p for p in r.json()["results"] if p["id"] == 1)
+
+    assert len(project["issues"]) == 1
+    assert project["issues"][0]["project_id"] == 1
+
+
+async def test_get_board(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/1/board?limit=1")
+    columns = {c["status"]: c for c in r.json()["columns"]}
+
+    assert r.status_code == 200
+    assert list(columns) == ["To do", "In progress", "Done"]
+    assert columns["To do"]["count"] == 2
+    assert len(columns["To do"]["results"]) == 1
+    assert columns["Done"]["results"] == []
+
+    r = await user_client.get("projects/1/issues", params={
+        "status": "To do",
+        "cursor": columns["To do"]["next_cursor"]
+    })
+    assert len(r.json()["results"]) == 1
+    assert r.json()["next_cursor"] is None
+
+
+async def test_get_board_not_exist_project(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/999/board")
+
+    assert r.json()["detail"] == "Project not found!"
+    assert r.status_code == 404
+
+
 async def test_get_issue(user_client: httpx.AsyncClient):
     r = await user_client.get("projects/1/issues/1")
     assert r.status_code == 200
@@ -238,6 +421,24 @@ async def test_update_issue(user_client: httpx.AsyncClient):
     assert r.status_code == 200
 
 
+async def test_get_updated_issue(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/1/issues/1")
+
+    assert r.json()["status"] == "Done"
+    assert r.status_code == 200
+
+
+async def test_get_issues_batch(user_client: httpx.AsyncClient):
+    # The second request is served from the cache.
+    for _ in range(2):
+        r = await user_client.get("projects/1/issues/batch?ids=2&ids=1&ids=999")
+        results = r.json()["results"]
+
+        assert [issue["id"] for issue in results] == [2, 1]
+        assert results[1]["status"] == "Done"
+        assert r.status_code == 200
+
+
 async def test_update_issue_exist_title(user_client: httpx.AsyncClient):
     r = await user_client.patch("projects/1/issues/2", json={"title": "Test issue"})
 
@@ -295,6 +496,136 @@ async def test_search_results(user_client: httpx.AsyncClient):
     ]
 
 
+async def test_search_limit(user_client: httpx.AsyncClient):
+    r = await user_client.get("search?q=test&limit=1")
+    results = r.json()
+
+    assert results["projects"] == [
+        {"id": 1, "name": "test_name", "key": "test_key"}
+    ]
+    assert results["projects_has_more"] is True
+
+    r = await user_client.get("search", params={
+        "q": "test",
+        "limit": 1,
+        "projects_cursor": results["projects_next_cursor"]
+    })
+    results = r.json()
+
+    assert results["projects"] == [
+        {"id": 2, "name": "test_name2", "key": "test_key2"}
+    ]
+    assert results["projects_has_more"] is False
+    assert results["projects_next_cursor"] is None
+
+
+async def test_search_invalid_cursor(user_client: httpx.AsyncClient):
+    r = await user_client.get("search?q=test&issues_cursor=invalid")
+
+    assert r.json()["detail"] == "Invalid cursor!"
+    assert r.status_code == 400
+
+
+async def test_search_prefix(user_client: httpx.AsyncClient):
+    r = await user_client.get("search?q=anot tes&mode=prefix")
+    results = r.json()
+
+    assert results["projects"] == []
+    assert results["issues"] == [
+        {"id": 2, "project_id": 1, "title": "Another test issue"}
+    ]
+
+
+async def test_search_fuzzy(user_client: httpx.AsyncClient):
+    r = await user_client.get("search?q=anothr&mode=fuzzy")
+    results = r.json()
+
+    assert results["projects"] == []
+    assert results["issues"] == [
+        {"id": 2, "project_id": 1, "title": "Another test issue"}
+    ]
+
+
+async def test_search_issue_without_description(
+    user_client: httpx.AsyncClient
+):
+    r = await user_client.post("projects/1/issues", json={
+        "title": "Undescribed issue",
+        "type": "Bug"
+    })
+    issue_id = r.json()["id"]
+
+    r = await user_client.get("search?q=undescribed")
+    await user_client.delete(f"projects/1/issues/{issue_id}")
+
+    assert r.json()["issues"] == [
+        {"id": issue_id, "project_id": 1, "title": "Undescribed issue"}
+    ]
+
+
+async def test_search_russian(user_client: httpx.AsyncClient):
+    r = await user_client.post("projects/1/issues", json={
+        "title": "Проверочная задача",
+        "type": "Bug"
+    })
+    issue_id = r.json()["id"]
+
+    # Another form of the words is found by the stems.
+    r = await user_client.get("search?q=проверочные задачи")
+    await user_client.delete(f"projects/1/issues/{issue_id}")
+
+    assert r.json()["issues"] == [
+        {"id": issue_id, "project_id": 1, "title": "Проверочная задача"}
+    ]
+
+
+async def test_sync(user_client: httpx.AsyncClient):
+    r = await user_client.get("sync")
+    token = r.json()["token"]
+
+    assert r.status_code == 200
+    assert {1, 2} <= {issue["id"] for issue in r.json()["issues"]}
+
+    r = await user_client.post("projects/1/issues", json={
+        "title": "Sync issue",
+        "type": "Bug"
+    })
+    issue_id = r.json()["id"]
+    await user_client.delete(f"projects/1/issues/{issue_id}")
+
+    r = await user_client.get("sync", params={"since": token})
+
+    assert issue_id in r.json()["deleted_issues"]
+    assert r.json()["token"] != token
+
+
+async def test_sync_issues_count(user_client: httpx.AsyncClient, monkeypatch):
+    # Without the overlap only the changes after the token are sent.
+    monkeypatch.setattr(sync_crud, "SYNC_OVERLAP_TIME", 0)
+
+    r = await user_client.get("sync")
+    token = r.json()["token"]
+    projects = {project["id"]: project for project in r.json()["projects"]}
+
+    r = await user_client.post("projects/1/issues", json={
+        "title": "Sync count issue",
+        "type": "Bug"
+    })
+    issue_id = r.json()["id"]
+
+    r = await user_client.get("sync", params={"since": token})
+    synced = {project["id"]: project for project in r.json()["projects"]}
+
+    assert synced[1]["issues_count"] == projects[1]["issues_count"] + 1
+
+    await user_client.delete(f"projects/1/issues/{issue_id}")
+
+
+async def test_sync_invalid_token(user_client: httpx.AsyncClient):
+    r = await user_client.get("sync?since=invalid")
+    assert r.status_code == 400
+
+
 async def test_delete_issue(user_client: httpx.AsyncClient):
     r = await user_client.delete("projects/1/issues/1")
     assert r.status_code == 200
@@ -312,6 +643,14 @@ async def test_delete_project(user_client: httpx.AsyncClient):
     assert r.status_code == 200
 
 
+async def test_get_issue_of_deleted_project(user_client: httpx.AsyncClient):
+    r = await user_client.get("projects/1/issues/2")
+    res = r.json()["detail"]
+
+    assert res == "Issue not found! Make sure that the correct data is passed."
+    assert r.status_code == 404
+
+
 async def test_delete_not_exist_project(user_client: httpx.AsyncClient):
     r = await user_client.delete("projects/1")
 
@@ -0,0 +1,427 @@
+import asyncio
+
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from metrics import router as metrics_router
+from utils import cache, local_cache as local_cache_module
+from utils.local_cache import LocalCache
+
+
+class FakeRedis:
+    """ In-memory Redis with the commands, that utils.cache uses. """
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+        self.sets: dict[str, set[bytes]] = {}
+        self.locks: set[str] = set()
+        self.connection_pool = self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(self)
+
+    def lock(self, name: str, timeout: float):
+        return FakeLock(self, name)
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self.data.get(key) for key in keys]
+
+    async def ttl(self, key: str) -> int:
+        return self.ttls.get(key, -1) if key in self.data else -2
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def incr(self, key: str) -> int:
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+    async def expire(self, key: str, time: int) -> bool:
+        self.ttls[key] = time
+        return True
+
+    async def publish(self, channel: str, message: str) -> int:
+        return 0
+
+    async def sadd(self, key: str, *values: str) -> int:
+        self.sets.setdefault(key, set()).update(v.encode() for v in values)
+        return len(values)
+
+    async def srem(self, key: str, *values: str) -> int:
+        self.sets.get(key, set()).difference_update(
+            v.encode() for v in values
+        )
+        return len(values)
+
+    async def smembers(self, key: str) -> set[bytes]:
+        return set(self.sets.get(key, set()))
+
+    # Defined last, so it doesn't shadow the builtin set above.
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ex: int | None = None,
+        nx: bool = False
+    ) -> bool | None:
+        if nx and key in self.data:
+            return None
+
+        self.data[key] = value
+        self.ttls.pop(key, None)
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def __getattr__(self, name: str):
+        def command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return command
+
+    async def execute(self) -> list:
+        commands, self.commands = self.commands, []
+        return [
+            await getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in commands
+        ]
+
+
+class FakeLock:
+    def __init__(self, redis: FakeRedis, name: str):
+        self.redis = redis
+        self.name = name
+
+    async def acquire(self, blocking: bool = True) -> bool:
+        if self.name in self.redis.locks:
+            return False
+        self.redis.locks.add(self.name)
+        return True
+
+    async def release(self):
+        self.redis.locks.discard(self.name)
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+@pytest.fixture
+def fake_cache(monkeypatch) -> FakeRedis:
+    """
+    Return FakeRedis with empty local cache, closed breaker
+    and no pending invalidations.
+    """
+    monkeypatch.setattr(cache, "local_cache", LocalCache(100, 30))
+    monkeypatch.setattr(cache, "_pending_namespaces", set())
+    monkeypatch.setattr(cache, "_pending_keys", set())
+    monkeypatch.setattr(
+        cache, "cache_breaker",
+        cache.CircuitBreaker("test", 5, 10, 1)
+    )
+    return FakeRedis()
+
+
+@pytest.fixture
+def refresh_session(monkeypatch) -> SimpleNamespace:
+    """ Return session for the background refresh, that uses FakeRedis. """
+    monkeypatch.setattr(
+        cache, "Redis", lambda connection_pool: connection_pool
+    )
+    return SimpleNamespace(bind=None)
+
+
+def test_local_cache_evicts_least_recently_used():
+    local_cache = LocalCache(2, 30)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2)
+
+    assert local_cache.get("a") == 1
+    local_cache.set("c", 3)
+
+    assert local_cache.get("b") is None
+    assert local_cache.get("a") == 1
+    assert local_cache.get("c") == 3
+
+
+def test_local_cache_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(
+        local_cache_module, "time", SimpleNamespace(monotonic=lambda: now[0])
+    )
+    local_cache = LocalCache(10, 30)
+    local_cache.set("a", 1)
+
+    now[0] += 30
+    assert local_cache.get("a") == 1
+
+    now[0] += 1
+    assert local_cache.get("a") is None
+
+
+def test_local_cache_invalidate():
+    local_cache = LocalCache(10, 30)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2)
+
+    local_cache.invalidate("a", "c")
+
+    assert local_cache.get("a") is None
+    assert local_cache.get("b") == 2
+
+
+def test_local_cache_generation():
+    local_cache = LocalCache(1000, 30)
+    # Keys sharing a slot share the generation.
+    b = next(
+        key for key in ("b", "c", "d")
+        if local_cache._slot(key) != local_cache._slot("a")
+    )
+    generation_a = local_cache.generation("a")
+    generation_b = local_cache.generation(b)
+
+    local_cache.invalidate("a")
+    local_cache.set("a", 1, generation_a)
+    local_cache.set(b, 2, generation_b)
+
+    # Only the invalidated key isn't set.
+    assert local_cache.get("a") is None
+    assert local_cache.get(b) == 2
+
+    generation_b = local_cache.generation(b)
+    local_cache.clear()
+    local_cache.set(b, 2, generation_b)
+
+    assert local_cache.get(b) is None
+
+
+async def test_cache_get_or_set_coalesces_misses(fake_cache: FakeRedis):
+    calls = 0
+
+    async def func(id: int) -> Item:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return Item(id=id, name="item")
+
+    results = await asyncio.gather(*[
+        cache.cache_get_or_set(fake_cache, "item_1", func, id=1)
+        for _ in range(5)
+    ])
+
+    assert calls == 1
+    assert results[0] == Item(id=1, name="item")
+    # The others got the value cached by the first one.
+    assert all(r.body == b'{"id":1,"name":"item"}' for r in results[1:])
+    assert not cache._key_locks
+
+
+async def test_cache_get_or_set_waits_for_lock_holder(fake_cache: FakeRedis):
+    calls = 0
+
+    async def func(id: int) -> Item:
+        nonlocal calls
+        calls += 1
+        return Item(id=id, name="item")
+
+    async def other_worker():
+        await asyncio.sleep(0.1)
+        await fake_cache.set("item_1", b'{"id":1,"name":"other"}')
+        fake_cache.locks.discard("lock_item_1")
+
+    # Another worker is recomputing the value.
+    fake_cache.locks.add("lock_item_1")
+    result, _ = await asyncio.gather(
+        cache.cache_get_or_set(fake_cache, "item_1", func, id=1),
+        other_worker()
+    )
+
+    assert calls == 0
+    assert result.body == b'{"id":1,"name":"other"}'
+
+
+async def test_refresh_logs_errors(
+    fake_cache: FakeRedis,
+    refresh_session: SimpleNamespace,
+    caplog
+):
+    async def page_gone(session):
+        raise HTTPException(status_code=404)
+
+    async def db_error(session):
+        raise RuntimeError("connection refused")
+
+    errors = cache.counters["cache_refresh_errors"]
+
+    assert not await cache._refresh(
+        fake_cache, "page_1", page_gone, refresh_session
+    )
+    assert await cache._refresh(
+        fake_cache, "page_2", db_error, refresh_session
+    )
+    assert cache.counters["cache_refresh_errors"] == errors + 1
+    assert "page_2" in caplog.text
+    # The locks are released.
+    assert not fake_cache.locks and not cache._refreshing
+
+
+async def test_refresh_hot_keeps_stale_time(
+    fake_cache: FakeRedis,
+    refresh_session: SimpleNamespace
+):
+    async def func(session, id: int) -> Item:
+        return Item(id=id, name="item")
+
+    params = cache._params({"id": 1})
+    await fake_cache.sadd("hot_items", params)
+
+    await cache._refresh_hot(
+        fake_cache, "items", func, refresh_session, stale_time=300
+    )
+
+    key = await cache.cache_versioned_key(fake_cache, "items", params)
+    assert fake_cache.data[key] == b'{"id":1,"name":"item"}'
+    assert fake_cache.ttls[key] == cache.REDIS_EXPIRE_TIME + 300
+
+
+async def test_read_doesnt_cache_deleted_row(
+    fake_cache: FakeRedis,
+    monkeypatch
+):
+    selected, deleted = asyncio.Event(), asyncio.Event()
+
+    async def func(id: int) -> Item:
+        # The row is selected before the delete commits.
+        item = Item(id=id, name="item")
+        selected.set()
+        await deleted.wait()
+        return item
+
+    read = asyncio.create_task(
+        cache.cache_get_or_set(fake_cache, "item_1", func, nx=True, id=1)
+    )
+    await selected.wait()
+    await cache.cache_delete(fake_cache, "item_1")
+    deleted.set()
+
+    assert await read == Item(id=1, name="item")
+    assert fake_cache.data["item_1"] == cache.TOMBSTONE
+    assert fake_cache.ttls["item_1"] == cache.CACHE_TOMBSTONE_TIME
+    # The next reads miss and get "not found" from the database.
+    assert await cache._cache_get(fake_cache, "item_1") == (None, None)
+    assert await cache._cache_get_many(fake_cache, ["item_1"]) == [None]
+    assert cache.local_cache.get("item_1") is None
+
+    # A write through lands right after the read's SET NX,
+    # its invalidation message before the read fills the local cache.
+    pipeline = fake_cache.pipeline
+
+    def pipeline_then_write(transaction: bool = True) -> FakePipeline:
+        pipe = pipeline(transaction)
+        execute = pipe.execute
+
+        async def execute_then_write() -> list:
+            keys = [
+                args[0] for name, args, _ in pipe.commands if name == "set"
+            ]
+            results = await execute()
+            for key in keys:
+                await fake_cache.set(key, b'{"id":0,"name":"new"}')
+                cache.local_cache.invalidate(key)
+            return results
+
+        pipe.execute = execute_then_write
+        return pipe
+
+    async def func_many(ids: list[int]) -> list[Item]:
+        return [Item(id=id, name="item") for id in ids]
+
+    monkeypatch.setattr(fake_cache, "pipeline", pipeline_then_write)
+    await cache.cache_get_or_set(fake_cache, "item_2", func, nx=True, id=2)
+    await cache.cache_get_or_set_many(fake_cache, {3: "item_3"}, func_many)
+
+    assert cache.local_cache.get("item_2") is None
+    assert cache.local_cache.get("item_3") is None
+
+
+async def test_metrics_hit_ratios(monkeypatch):
+    monkeypatch.setattr(metrics_router, "counters", Counter({
+        "search_hits": 3,
+        "search_misses": 1,
+        "cache_stale_hits": 2,
+        "cache_refreshes": 2
+    }))
+
+    results = await metrics_router.metrics(user=None)
+
+    assert results["search_hit_ratio"] == 0.75
+    assert "cache_stale_hit_ratio" not in results
+
+
+def test_cache_encode_compresses_large_values():
+    value = b'{"results":[' + b'{"id":1},' * 1000 + b'{"id":1}]}'
+    encoded = cache.cache_encode(value)
+
+    assert encoded.startswith(cache.ZLIB_MARKER)
+    assert len(encoded) < len(value)
+    assert cache.cache_decode(encoded) == value
+
+
+def test_cache_decode_uncompressed_values():
+    # Small values and values cached before compression was added.
+    small = b'{"id":1}'
+    legacy = b'{"results":[' + b'{"id":1},' * 1000 + b'{"id":1}]}'
+
+    assert cache.cache_encode(small) == small
+    assert cache.cache_decode(small) == small
+    assert cache.cache_decode(legacy) == legacy
+
+
+async def test_read_applies_pending_invalidation_first(fake_cache: FakeRedis):
+    async def func(id: int) -> Item:
+        return Item(id=id, name="new")
+
+    params = cache._params({"id": 1})
+    fake_cache.data[f'items_v0_{params}'] = b'{"id":1,"name":"old"}'
+
+    # The invalidation is deferred, as Redis is unavailable.
+    cache.cache_breaker.opened_at = cache.time.monotonic()
+    await cache.cache_invalidate(fake_cache, "items")
+    assert cache._pending_namespaces == {"items"}
+
+    cache.cache_breaker.opened_at = None
+    result = await cache.cache_get_or_set_versioned(
+        fake_cache, "items", func, id=1
+    )
+
+    assert result == Item(id=1, name="new")
+    assert not cache._pending_namespaces
+    assert fake_cache.data["version_items"] == b"1"
@@ -0,0 +1,184 @@
+import asyncio
+
+from types import SimpleNamespace
+
+import pytest
+
+from redis.asyncio import Redis
+
+from utils import cache, circuit_breaker
+from utils.circuit_breaker import CircuitBreaker, CircuitBreakerError
+from utils.local_cache import LocalCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(
+        circuit_breaker, "time", SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+@pytest.fixture
+def breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        "test", max_failures=3, reset_time=10, timeout=0.05,
+        errors=(OSError,), ignored=(cache.PoolExhaustedError,)
+    )
+
+
+async def succeed():
+    return "ok"
+
+
+async def fail():
+    raise OSError("connection refused")
+
+
+async def hang():
+    await asyncio.sleep(1)
+
+
+async def call_failing(breaker: CircuitBreaker, coro_func=fail, times=1):
+    for _ in range(times):
+        with pytest.raises(CircuitBreakerError):
+            await breaker.call(coro_func())
+
+
+async def test_breaker_opens_after_max_failures(breaker: CircuitBreaker):
+    await call_failing(breaker, fail)
+    await call_failing(breaker, hang)
+    assert not breaker.is_open
+
+    await call_failing(breaker, fail)
+    assert breaker.is_open
+
+    # Calls fail fast without being awaited.
+    coro = succeed()
+    with pytest.raises(CircuitBreakerError):
+        await breaker.call(coro)
+    assert coro.cr_frame is None
+
+
+async def test_breaker_success_resets_failures(breaker: CircuitBreaker):
+    await call_failing(breaker, times=2)
+    assert await breaker.call(succeed()) == "ok"
+    await call_failing(breaker, times=2)
+
+    assert not breaker.is_open
+
+
+async def test_breaker_half_open(breaker: CircuitBreaker, clock: Clock):
+    await call_failing(breaker, times=3)
+    clock.now += 10
+
+    # A call is let through after reset_time, its failure opens it again.
+    assert not breaker.is_open
+    await call_failing(breaker)
+    assert breaker.is_open
+
+    clock.now += 10
+
+    # Its success closes it.
+    assert await breaker.call(succeed()) == "ok"
+    assert breaker.failures == 0
+    assert breaker.opened_at is None
+
+
+async def test_breaker_ignores_exhausted_pool(breaker: CircuitBreaker):
+    pool = cache.CachePool(max_connections=1, timeout=0.01)
+    # All connections are in use.
+    pool.can_get_connection = lambda: False
+
+    async def exhausted():
+        await pool.get_connection("GET")
+
+    await call_failing(breaker, exhausted, times=5)
+
+    assert breaker.failures == 0
+    assert not breaker.is_open
+
+
+class HangingRedis(Redis):
+    """ Redis, that never answers. """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def execute_command(self, *args, **options):
+        self.calls += 1
+        await asyncio.sleep(1)
+
+    def pipeline(self, transaction: bool = True):
+        return HangingPipeline(self)
+
+
+class HangingPipeline:
+    def __init__(self, redis: HangingRedis):
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def __getattr__(self, name: str):
+        return lambda *args, **kwargs: self
+
+    async def execute(self):
+        return await self.redis.execute_command()
+
+
+@pytest.fixture
+def hanging_cache(monkeypatch, breaker: CircuitBreaker) -> HangingRedis:
+    monkeypatch.setattr(cache, "local_cache", LocalCache(100, 30))
+    monkeypatch.setattr(cache, "cache_breaker", breaker)
+    return HangingRedis()
+
+
+async def test_local_hits_dont_close_breaker(hanging_cache: HangingRedis):
+    bypasses = cache.counters["cache_bypasses"]
+
+    async def func(id: int) -> dict:
+        return {"id": id}
+
+    # The generation is cached locally, the values are in hanging Redis.
+    cache.local_cache.set("version_items", 0)
+
+    for id in range(10):
+        result = await cache.cache_get_or_set_versioned(
+            hanging_cache, "items", func, id=id
+        )
+        assert result == {"id": id}
+
+    # Redis was waited for only until the circuit opened.
+    assert cache.cache_breaker.is_open
+    assert hanging_cache.calls == 3
+    assert cache.counters["cache_bypasses"] == bypasses + 10
+
+
+async def test_local_hits_are_served_while_open(hanging_cache: HangingRedis):
+    await call_failing(cache.cache_breaker, times=3)
+    cache.local_cache.set("version_items", 0)
+    cache.local_cache.set('items_v0_{"id": 1}', b'{"id":1}')
+
+    async def func(id: int) -> dict:
+        raise AssertionError("The local value must be returned")
+
+    result = await cache.cache_get_or_set_versioned(
+        hanging_cache, "items", func, id=1
+    )
+
+    assert result.body == b'{"id":1}'
+    assert hanging_cache.calls == 0
@@ -0,0 +1,147 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from projects.models import Project
+from issues.models import Issue
+from utils.pagination import ProjectsPagination, IssuesPagination
+
+
+@pytest.fixture(scope="module")
+async def dataset(session: AsyncSession) -> tuple[int, int]:
+    """
+    Seed enough users, projects and issues for the planner
+    to prefer the indexes and return ids of one author and its project.
+    """
+    await session.execute(text("""
+        INSERT INTO auth_user (username, hashed_password, first_name, email)
+        SELECT 'explain_' || i, '', '', 'explain_' || i || '@test.com'
+        FROM generate_series(1, 100) AS i
+    """))
+    await session.execute(text("""
+        INSERT INTO project (name, key, favorite, author_id)
+        SELECT 'Explain ' || i, 'EXP' || i, i % 5 = 0, auth_user.id
+        FROM auth_user, generate_series(1, 20) AS i
+        WHERE auth_user.username LIKE 'explain_%'
+    """))
+    await session.execute(text("""
+        INSERT INTO issue (
+            project_id, author_id, title, description,
+            type, priority, status
+        )
+        SELECT
+            project.id, project.author_id, 'Explain ' || i, '',
+            CASE WHEN i % 2 = 0 THEN 'Bug' ELSE 'Feature' END,
+            'Medium', 'To do'
+        FROM project, generate_series(1, 20) AS i
+        WHERE project.key LIKE 'EXP%'
+    """))
+    await session.commit()
+
+    await session.execute(text("ANALYZE auth_user, project, issue"))
+
+    project = (
+        await session.execute(
+            text("SELECT id, author_id FROM project WHERE key = 'EXP1'")
+        )
+    ).first()
+    return project.author_id, project.id
+
+
+async def explain(session: AsyncSession, statement) -> str:
+    compiled = statement.compile(
+        dialect=session.bind.dialect,
+        compile_kwargs={"render_postcompile": True}
+    )
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN {compiled}", params)
+    return "\n".join(row[0] for row in result)
+
+
+async def test_projects_list_plan(session: AsyncSession, dataset):
+    author_id, _ = dataset
+
+    plan = await explain(session, ProjectsPagination._page_statement(
+        Project, author_id, None, 10, 10
+    ))
+
+    assert "project_list_idx" in plan
+    assert "Sort" not in plan
+
+
+async def test_issues_list_plan(session: AsyncSession, dataset):
+    author_id, project_id = dataset
+
+    plan = await explain(session, IssuesPagination._page_statement(
+        Issue, author_id, project_id, 10, 10
+    ))
+
+    assert "issue_list_idx" in plan
+    assert "Sort" not in plan
+
+
+async def test_issues_cursor_plan(session: AsyncSession, dataset):
+    author_id, project_id = dataset
+    after = ["Bug", datetime.now(timezone.utc), 1]
+
+    plan = await explain(session, IssuesPagination._page_statement(
+        Issue, author_id, project_id, 0, 10, after
+    ))
+
+    assert "issue_list_idx" in plan
+    assert "Sort" not in plan
+
+
+async def test_issues_status_filter_plan(session: AsyncSession, dataset):
+    author_id, project_id = dataset
+
+    plan = await explain(session, IssuesPagination._page_statement(
+        Issue, author_id, project_id, 0, 10, filters={"status": ["To do"]}
+    ))
+
+    assert "issue_status_idx" in plan
+    assert "Sort" not in plan
+
+
+async def test_issues_sort_plan(session: AsyncSession, dataset):
+    author_id, project_id = dataset
+
+    plan = await explain(session, IssuesPagination._page_statement(
+        Issue, author_id, project_id, 0, 10, filters={"sort": "-created"}
+    ))
+
+    assert "issue_created_idx" in plan
+    assert "Sort" not in plan
+
+
+async def test_projects_embedded_issues_plan(
+    session: AsyncSession,
+    dataset
+):
+    author_id, _ = dataset
+
+    plan = await explain(session, ProjectsPagination._page_statement(
+        Project, author_id, None, 0, 10, embed=5
+    ))
+
+    assert "project_list_idx" in plan
+    assert "issue_created_idx" in plan
+    assert "Sort" not in plan
+
+
+async def test_issues_filtered_cursor_plan(session: AsyncSession, dataset):
+    author_id, project_id = dataset
+    after = ["Bug", datetime.now(timezone.utc), 1]
+
+    plan = await explain(session, IssuesPagination._page_statement(
+        Issue, author_id, project_id, 0, 10, after,
+        filters={"priority": ["Medium"]}, with_count=False
+    ))
+
+    # Cursor pages don't count all the filtered issues.
+    assert "Aggregate" not in plan
@@ -0,0 +1,45 @@
+from typing import Annotated
+
+from fastapi import Depends, Query
+
+from sqlalchemy import select, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, INTEGER
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from pydantic import BaseModel
+
+from config import BATCH_MAX_IDS
+
+
+async def ids_query_params(
+    ids: Annotated[
+        list[int], Query(min_length=1, max_length=BATCH_MAX_IDS)
+    ]
+):
+    """ Repeat ids to get all of them at once, in the order passed. """
+    return list(dict.fromkeys(ids))
+
+
+ids_params = Annotated[list[int], Depends(ids_query_params)]
+
+
+async def get_by_ids_db(
+    session: AsyncSession,
+    model,
+    schema: type[BaseModel],
+    ids: list[int],
+    *conditions
+) -> list[BaseModel]:
+    """ Return rows of the model with the ids, that meet the conditions. """
+
+    # One array param keeps the statement the same for any number of ids.
+    query = (
+        select(model)
+        .where(
+            model.id == any_(bindparam("ids", ids, type_=ARRAY(INTEGER))),
+            *conditions
+        )
+    )
+    rows = await session.scalars(query)
+
+    return [schema.model_validate(row) for row in rows]
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+from typing import Any, Coroutine
+
+from .metrics import counters
+
+
+class CircuitBreakerError(Exception):
+    """ The call failed, timed out or wasn't made as the circuit is open. """
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing service for a while.
+
+    After max_failures failed (or timed out) calls in a row the circuit
+    opens and calls fail fast for reset_time seconds. Then calls are let
+    through again: the first success closes the circuit,
+    a failure opens it for another reset_time.
+
+    Errors of ignored fail the call, but aren't failures of the service,
+    e.g. waiting too long for a free connection of the pool.
+
+    State changes are counted as {name}_breaker_opens/{name}_breaker_closes,
+    {name}_breaker_open is 1 while the circuit is open.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_failures: int,
+        reset_time: float,
+        timeout: float,
+        errors: tuple[type[Exception], ...] = (Exception,),
+        ignored: tuple[type[Exception], ...] = ()
+    ):
+        self.name = name
+        self.max_failures = max_failures
+        self.reset_time = reset_time
+        self.timeout = timeout
+        self.errors = errors
+        self.ignored = ignored
+
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return (
+            self.opened_at is not None
+            and time.monotonic() - self.opened_at < self.reset_time
+        )
+
+    async def call(self, coro: Coroutine, timeout: float | None = None) -> Any:
+        """ Await coro within timeout, unless the circuit is open. """
+
+        if self.is_open:
+            coro.close()
+            raise CircuitBreakerError(f"The {self.name} circuit is open!")
+
+        try:
+            result = await asyncio.wait_for(coro, timeout or self.timeout)
+        except self.ignored as e:
+            raise CircuitBreakerError(f"The {self.name} call failed!") from e
+        except (TimeoutError, *self.errors) as e:
+            self._on_failure()
+            raise CircuitBreakerError(f"The {self.name} call failed!") from e
+        else:
+            self._on_success()
+            return result
+
+    def _on_failure(self):
+        self.failures += 1
+
+        if self.opened_at is not None:
+            self.opened_at = time.monotonic()
+        elif self.failures >= self.max_failures:
+            self.opened_at = time.monotonic()
+            counters[f"{self.name}_breaker_opens"] += 1
+            counters[f"{self.name}_breaker_open"] = 1
+
+    def _on_success(self):
+        self.failures = 0
+
+        if self.opened_at is not None:
+            self.opened_at = None
+            counters[f"{self.name}_breaker_closes"] += 1
+            counters[f"{self.name}_breaker_open"] = 0
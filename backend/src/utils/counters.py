@@ -0,0 +1,154 @@
+"""
+Denormalized counters of the projects (issues_count, to_do_count,
+in_progress_count, done_count) and of the users (projects_count).
+
+They are kept by the triggers below in the same transaction as the write,
+so they are exact. The triggers bump project.updated too, so /sync sends
+the project again with its new counters. If they drift anyway (e.g. the triggers were disabled
+for a bulk load), repair them with:
+
+    cd src && python -m utils.counters
+"""
+import asyncio
+
+from sqlalchemy import DDL, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+issue_counters_function = DDL("""
+CREATE OR REPLACE FUNCTION issue_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE project SET
+            updated = now(),
+            issues_count = issues_count - 1,
+            to_do_count = to_do_count - (OLD.status = 'To do')::int,
+            in_progress_count = (
+                in_progress_count - (OLD.status = 'In progress')::int
+            ),
+            done_count = done_count - (OLD.status = 'Done')::int
+        WHERE id = OLD.project_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE project SET
+            updated = now(),
+            issues_count = issues_count + 1,
+            to_do_count = to_do_count + (NEW.status = 'To do')::int,
+            in_progress_count = (
+                in_progress_count + (NEW.status = 'In progress')::int
+            ),
+            done_count = done_count + (NEW.status = 'Done')::int
+        WHERE id = NEW.project_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""")
+
+issue_counters_trigger = DDL("""
+CREATE TRIGGER issue_counters
+AFTER INSERT OR DELETE ON issue
+FOR EACH ROW EXECUTE FUNCTION issue_counters()
+""")
+
+# Separate, as INSERT and DELETE triggers can't refer to both OLD and NEW.
+issue_counters_update_trigger = DDL("""
+CREATE TRIGGER issue_counters_update
+AFTER UPDATE OF status, project_id ON issue
+FOR EACH ROW
+WHEN (
+    OLD.status IS DISTINCT FROM NEW.status
+    OR OLD.project_id IS DISTINCT FROM NEW.project_id
+)
+EXECUTE FUNCTION issue_counters()
+""")
+
+project_counters_function = DDL("""
+CREATE OR REPLACE FUNCTION project_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE auth_user SET projects_count = projects_count - 1
+        WHERE id = OLD.author_id;
+    ELSE
+        UPDATE auth_user SET projects_count = projects_count + 1
+        WHERE id = NEW.author_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""")
+
+project_counters_trigger = DDL("""
+CREATE TRIGGER project_counters
+AFTER INSERT OR DELETE ON project
+FOR EACH ROW EXECUTE FUNCTION project_counters()
+""")
+
+reconcile_projects = text("""
+UPDATE project SET
+    issues_count = counts.issues_count,
+    to_do_count = counts.to_do_count,
+    in_progress_count = counts.in_progress_count,
+    done_count = counts.done_count
+FROM (
+    SELECT
+        project.id,
+        count(issue.id) AS issues_count,
+        count(issue.id) FILTER (WHERE issue.status = 'To do') AS to_do_count,
+        count(issue.id) FILTER (
+            WHERE issue.status = 'In progress'
+        ) AS in_progress_count,
+        count(issue.id) FILTER (WHERE issue.status = 'Done') AS done_count
+    FROM project
+    LEFT JOIN issue ON issue.project_id = project.id
+    GROUP BY project.id
+) AS counts
+WHERE project.id = counts.id AND (
+    project.issues_count, project.to_do_count,
+    project.in_progress_count, project.done_count
+) IS DISTINCT FROM (
+    counts.issues_count, counts.to_do_count,
+    counts.in_progress_count, counts.done_count
+)
+""")
+
+reconcile_users = text("""
+UPDATE auth_user SET projects_count = counts.projects_count
+FROM (
+    SELECT auth_user.id, count(project.id) AS projects_count
+    FROM auth_user
+    LEFT JOIN project ON project.author_id = auth_user.id
+    GROUP BY auth_user.id
+) AS counts
+WHERE auth_user.id = counts.id
+AND auth_user.projects_count IS DISTINCT FROM counts.projects_count
+""")
+
+
+async def reconcile_counters(session: AsyncSession) -> tuple[int, int]:
+    """
+    Recount the counters from the source rows and fix the drifted ones.
+
+    Return the number of fixed projects and users.
+    """
+    projects = await session.execute(reconcile_projects)
+    users = await session.execute(reconcile_users)
+    await session.commit()
+
+    return projects.rowcount, users.rowcount
+
+
+async def main():
+    from utils.db import async_session_maker
+
+    async with async_session_maker() as session:
+        projects, users = await reconcile_counters(session)
+
+    print(f"Fixed counters of {projects} projects and {users} users.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
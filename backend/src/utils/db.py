@@ -2,6 +2,7 @@ from typing import AsyncGenerator, Annotated
 
 from fastapi import HTTPException
 
+from sqlalchemy import text
 from sqlalchemy.orm import DeclarativeBase, mapped_column
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import (
@@ -13,6 +14,8 @@ from config import DB_URI
 
 
 intpk = Annotated[int, mapped_column(primary_key=True, index=True)]
+# Kept by triggers, see utils.counters.
+counter = Annotated[int, mapped_column(server_default=text("0"))]
 
 
 class Base(DeclarativeBase):
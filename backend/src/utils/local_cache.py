@@ -0,0 +1,75 @@
+import time
+
+from collections import OrderedDict
+from typing import Any
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with TTL.
+
+    Lives in every worker in front of Redis.
+    The TTL is a safety net only: entries are evicted
+    by invalidation messages as soon as any worker writes.
+    """
+
+    def __init__(self, max_size: int, expire_time: int):
+        self.max_size = max_size
+        self.expire_time = expire_time
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Invalidations of the keys hashed into max_size slots
+        # and of the whole cache, see generation.
+        self._generations = [0] * max(max_size, 1)
+        self._clears = 0
+
+    def get(self, key: str) -> Any | None:
+        try:
+            expires, value = self._data[key]
+        except KeyError:
+            return None
+
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, generation: tuple | None = None):
+        """
+        Set value of the key.
+
+        With generation the value is set only if the key wasn't invalidated
+        since generation(key) returned it, so a value read from Redis
+        before an invalidation isn't remembered after it.
+        """
+        if generation is not None and generation != self.generation(key):
+            return
+
+        self._data[key] = (time.monotonic() + self.expire_time, value)
+        self._data.move_to_end(key)
+
+        if len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def generation(self, key: str) -> tuple[int, int]:
+        """
+        Return the generation of the key, that changes
+        when the key is invalidated or the cache is cleared.
+
+        Keys sharing a slot share the generation, so an invalidation
+        can skip setting a few unrelated keys, but never a key of its own.
+        """
+        return self._clears, self._generations[self._slot(key)]
+
+    def invalidate(self, *keys: str):
+        for key in keys:
+            self._data.pop(key, None)
+            self._generations[self._slot(key)] += 1
+
+    def clear(self):
+        self._data.clear()
+        self._clears += 1
+
+    def _slot(self, key: str) -> int:
+        return hash(key) % len(self._generations)
@@ -0,0 +1,5 @@
+from collections import Counter
+
+
+# Counters of this worker, e.g. cache_stale_hits or cache_refreshes.
+counters: Counter[str] = Counter()
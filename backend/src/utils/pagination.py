@@ -1,38 +1,214 @@
+import json
+
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from binascii import Error as Base64Error
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
 
-from sqlalchemy import select, func
+from sqlalchemy import (
+    select, exists, func, literal, null, true, tuple_, and_, or_
+)
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from pydantic import BaseModel
 
-from projects.schemas import ProjectSchema, PaginationProject
+from config import CACHE_HOT_PAGES
+from projects.schemas import (
+    ProjectSchema, PaginationProject, SparsePaginationProject,
+    EmbeddedPaginationProject
+)
 from projects.models import Project
-from issues.schemas import IssueSchema, PaginationIssue
+from issues.models import Issue
+from auth.models import User
+from issues.schemas import (
+    IssueSchema, PaginationIssue, SparsePaginationIssue,
+    IssueStatus, IssuePriority, IssueType, IssueSort
+)
+
+
+STATUS_COUNTERS = {
+    IssueStatus.to_do.value: Project.to_do_count,
+    IssueStatus.in_progress.value: Project.in_progress_count,
+    IssueStatus.done.value: Project.done_count
+}
 
 
-async def pagination_query_params(page: int = 1, limit: int = 10):
-    return {"page": page, "limit": limit}
+async def pagination_query_params(
+    page: int = 1,
+    limit: int = 10,
+    cursor: str | None = None
+):
+    """
+    Pass cursor to get a page after it instead of the page number
+    (an empty one for the first page), see next_cursor of the response.
+    """
+    return {"page": page, "limit": limit, "cursor": cursor}
 
 
 pagination_params = Annotated[dict, Depends(pagination_query_params)]
 
 
+async def issues_filter_query_params(
+    status: Annotated[list[IssueStatus] | None, Query()] = None,
+    priority: Annotated[list[IssuePriority] | None, Query()] = None,
+    type: Annotated[list[IssueType] | None, Query()] = None,
+    sort: IssueSort = IssueSort.type
+):
+    """
+    Repeat status, priority or type to get issues with any of the values.
+    Only passed filters are returned, so they can be a part of a cache key.
+    """
+    filters = {
+        name: sorted({value.value for value in values})
+        for name, values in (
+            ("status", status), ("priority", priority), ("type", type)
+        )
+        if values
+    }
+    if sort != IssueSort.type:
+        filters["sort"] = sort.value
+    return filters
+
+
+issues_filter_params = Annotated[dict, Depends(issues_filter_query_params)]
+
+
+def fields_query_params(schema: type[BaseModel]):
+    """
+    Return dependency for the fields param, that selects only
+    the passed comma-separated fields of the schema.
+    """
+    allowed = schema.model_fields.keys()
+
+    async def dependency(fields: str | None = None) -> list[str] | None:
+        if fields is None:
+            return None
+
+        names = sorted({name.strip() for name in fields.split(",")})
+        unknown = [name for name in names if name not in allowed]
+
+        if unknown:
+            raise HTTPException(
+                400,
+                f"Unknown fields: {', '.join(unknown)}!"
+            )
+        return names
+
+    return dependency
+
+
+project_fields_params = Annotated[
+    list[str] | None, Depends(fields_query_params(PaginationProject))
+]
+issue_fields_params = Annotated[
+    list[str] | None, Depends(fields_query_params(PaginationIssue))
+]
+
+
+def is_hot_page(pagination_params: dict) -> bool:
+    """ Return whether the page is refreshed in the cache after writes. """
+
+    if pagination_params["cursor"] is not None:
+        return not pagination_params["cursor"]
+    return pagination_params["page"] <= CACHE_HOT_PAGES
+
+
+Results = (
+    list[PaginationProject] | list[EmbeddedPaginationProject]
+    | list[PaginationIssue]
+    | list[SparsePaginationProject] | list[SparsePaginationIssue]
+)
+
+
 class PaginatedResponse(BaseModel):
     count: int
     page: int
     next_page: int | None
     prev_page: int | None
     total_pages: int | float
-    results: list[PaginationProject] | list[PaginationIssue]
+    results: Results
+
+
+class CursorPaginatedResponse(BaseModel):
+    next_cursor: str | None
+    results: Results
 
 
 class NoItemsResponse(BaseModel):
     results: str
 
 
+def encode_cursor(values: list) -> str:
+    """ Return opaque cursor for the sort key values of the last row. """
+    data = json.dumps(values, default=datetime.isoformat)
+    return urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor: str, order: tuple) -> list:
+    """ Return sort key values of the cursor, made by encode_cursor. """
+
+    try:
+        values = json.loads(urlsafe_b64decode(cursor))
+
+        if not isinstance(values, list) or len(values) != len(order):
+            raise ValueError
+
+        return [
+            decode_value(column.type.python_type, value)
+            for (column, _), value in zip(order, values)
+        ]
+    except (ValueError, TypeError, Base64Error):
+        raise HTTPException(400, "Invalid cursor!")
+
+
+def decode_value(python_type: type, value):
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+
+    if not isinstance(value, python_type):
+        raise TypeError
+    return value
+
+
+def keyset_condition(order: tuple, values: list):
+    """
+    Return condition for rows, that go after values in the order.
+
+    Row comparison is used where all the directions are the same,
+    as it can be answered by an index range scan.
+    """
+    values = [
+        literal(value, column.type)
+        for (column, _), value in zip(order, values)
+    ]
+    return _keyset_condition(order, values)
+
+
+def _keyset_condition(order: tuple, values: list):
+    columns = [column for column, _ in order]
+    descending = order[0][1]
+
+    if all(column_descending == descending for _, column_descending in order):
+        if descending:
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+
+    column, value = columns[0], values[0]
+
+    return or_(
+        column < value if descending else column > value,
+        and_(column == value, _keyset_condition(order[1:], values[1:]))
+    )
+
+
 class PaginationInterface:
+    # Results of the response, when there are no items at all.
+    no_items_message: str
+    # Schema of the items, when only some fields are requested.
+    sparse_schema: type[BaseModel]
 
     @staticmethod
     def _validate_params(
@@ -60,21 +236,171 @@ class PaginationInterface:
         return total_pages, next_page, previous_page
 
     @staticmethod
-    def _count_query(
-        session: AsyncSession,
+    def _filter(
+        model: ProjectSchema | IssueSchema,
+        user_id: int,
+        project_id: int | None = None,
+        filters: dict | None = None
+    ) -> tuple: ...
+
+    @staticmethod
+    def _summary(
         model: ProjectSchema | IssueSchema,
         user_id: int,
         project_id: int | None = None,
-    ): ...
+        filters: dict | None = None,
+        with_count: bool = True
+    ):
+        """
+        Return single row query with parent_exists and count of the items,
+        that is read from the parent row (see utils.counters) if possible.
+
+        Without with_count the count can be NULL, unless it's
+        as cheap as reading the parent row.
+        """
+
+    @staticmethod
+    def _order(
+        model: ProjectSchema | IssueSchema,
+        filters: dict | None = None
+    ) -> tuple:
+        """
+        Return sort key as (column, descending) pairs.
+        It must end with a unique column for the cursors to work.
+        """
 
-    def _items_query(
+    @staticmethod
+    def _embed(query, items, user_id: int, limit: int):
+        """
+        Return page query with the first limit children of every item
+        joined laterally, as the last column.
+        """
+
+    @staticmethod
+    def _embedded_items(rows: list) -> list:
+        """ Return items of the page with their children (see _embed). """
+
+    @classmethod
+    def _order_by(
+        cls,
+        model: ProjectSchema | IssueSchema,
+        filters: dict | None = None
+    ) -> list:
+        return [
+            column.desc() if descending else column
+            for column, descending in cls._order(model, filters)
+        ]
+
+    @classmethod
+    def _page_statement(
+        cls,
+        model: ProjectSchema | IssueSchema,
+        user_id: int,
+        project_id: int | None,
+        offset: int,
+        limit: int,
+        after: list | None = None,
+        filters: dict | None = None,
+        fields: list[str] | None = None,
+        embed: int = 0,
+        with_count: bool = True
+    ):
+        """
+        Return statement for the summary and the items of the page.
+
+        The page is joined laterally to the single row summary,
+        so there is a row even if the page is empty.
+
+        With fields only those and the sort key columns are selected.
+        With embed up to that many children are joined to every item.
+        """
+        summary = cls._summary(
+            model, user_id, project_id, filters, with_count
+        ).subquery()
+        order = cls._order(model, filters)
+
+        if fields is None:
+            columns = [model]
+        else:
+            names = dict.fromkeys([*fields, *(c.key for c, _ in order)])
+            columns = [getattr(model, name) for name in names]
+
+        items_query = (
+            select(*columns)
+            .where(*cls._filter(model, user_id, project_id, filters))
+            .order_by(*cls._order_by(model, filters))
+            .offset(offset)
+            .limit(limit)
+        )
+        if after is not None:
+            items_query = items_query.where(keyset_condition(order, after))
+        items = items_query.lateral()
+
+        query = (
+            select(summary, aliased(model, items) if fields is None else items)
+            .select_from(summary)
+            .outerjoin(items, true())
+        )
+        if embed:
+            query = cls._embed(query, items, user_id, embed)
+        return query
+
+    @classmethod
+    async def _page_query(
+        cls,
         session: AsyncSession,
         model: ProjectSchema | IssueSchema,
         user_id: int,
+        project_id: int | None,
         offset: int,
         limit: int,
-        project_id: int | None = None,
-    ): ...
+        after: list | None = None,
+        filters: dict | None = None,
+        fields: list[str] | None = None,
+        embed: int = 0,
+        with_count: bool = True
+    ) -> tuple[int | None, list]:
+        """
+        Return count of all the items and the items of the page
+        in one round trip. Without with_count the count can be None.
+
+        The items are model instances or, with fields, rows
+        or, with embed, schemas with the children.
+        """
+        query = cls._page_statement(
+            model, user_id, project_id, offset, limit, after, filters, fields,
+            embed, with_count
+        )
+        rows = (await session.execute(query)).all()
+
+        if not rows[0].parent_exists:
+            raise HTTPException(404, "Project not found!")
+
+        if embed:
+            items = cls._embedded_items(rows)
+        elif fields is None:
+            items = [row[-1] for row in rows if row[-1] is not None]
+        else:
+            # Sort keys end with id, so it is always selected.
+            items = [row for row in rows if row.id is not None]
+
+        return rows[0].count, items
+
+    @classmethod
+    def _results(cls, items: list, fields: list[str] | None = None) -> list:
+        if fields is None:
+            return items
+
+        return [
+            cls.sparse_schema(**{name: getattr(item, name) for name in fields})
+            for item in items
+        ]
+
+    @classmethod
+    def _no_items(cls, filters: dict | None = None) -> NoItemsResponse:
+        if filters:
+            return NoItemsResponse(results="No items match the filters!")
+        return NoItemsResponse(results=cls.no_items_message)
 
     @classmethod
     async def get_paginated(
@@ -83,32 +409,40 @@ class PaginationInterface:
         model: ProjectSchema | IssueSchema,
         pagination_params: pagination_params,
         user_id: int,
-        project_id: int | None = None
-    ) -> PaginatedResponse | NoItemsResponse:
+        project_id: int | None = None,
+        filters: dict | None = None,
+        fields: list[str] | None = None,
+        embed: int = 0
+    ) -> PaginatedResponse | CursorPaginatedResponse | NoItemsResponse:
 
         page, limit = pagination_params["page"], pagination_params["limit"]
+        cursor = pagination_params.get("cursor")
 
         if page < 0 or limit < 0:
             raise HTTPException(
                 400,
                 "The page and/or limit cannot be less than zero!"
             )
+
+        if embed and fields is not None:
+            raise HTTPException(400, "Fields can't be used with embedding!")
+
+        if cursor is not None:
+            return await cls.get_cursor_paginated(
+                session, model, cursor, limit, user_id, project_id,
+                filters, fields, embed
+            )
         offset = (page - 1) * limit
 
-        count = await cls._count_query(session, model, user_id, project_id)
+        count, results = await cls._page_query(
+            session, model, user_id, project_id, offset, limit,
+            filters=filters, fields=fields, embed=embed
+        )
 
-        if not isinstance(count, int):
-            return count
+        if count == 0:
+            return cls._no_items(filters)
 
         total_pages, next_page, previous_page = cls._validate_params(count, limit, page)
-        results = await cls._items_query(
-            session,
-            model,
-            user_id,
-            offset,
-            limit,
-            project_id
-        )
 
         return PaginatedResponse(
             count=count,
@@ -116,108 +450,217 @@ class PaginationInterface:
             next_page=next_page,
             prev_page=previous_page,
             total_pages=total_pages,
-            results=results.all()
+            results=cls._results(results, fields)
+        )
+
+    @classmethod
+    async def get_cursor_paginated(
+        cls,
+        session: AsyncSession,
+        model: ProjectSchema | IssueSchema,
+        cursor: str,
+        limit: int,
+        user_id: int,
+        project_id: int | None = None,
+        filters: dict | None = None,
+        fields: list[str] | None = None,
+        embed: int = 0
+    ) -> CursorPaginatedResponse | NoItemsResponse:
+        """
+        Return the page after the cursor (the first one for an empty cursor).
+
+        Rows are filtered by the sort key instead of OFFSET,
+        so any page costs the same as the first one.
+        """
+        if limit == 0:
+            raise HTTPException(400, "The limit must be greater than zero!")
+
+        order = cls._order(model, filters)
+        after = decode_cursor(cursor, order) if cursor else None
+
+        # One row more tells whether there is the next page.
+        # Cursor pages have no count, so the items aren't counted.
+        _, results = await cls._page_query(
+            session, model, user_id, project_id, 0, limit + 1, after,
+            filters, fields, embed, with_count=False
+        )
+
+        if not results and after is None:
+            return cls._no_items(filters)
+
+        next_cursor = None
+
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = encode_cursor(
+                [getattr(results[-1], column.key) for column, _ in order]
+            )
+
+        return CursorPaginatedResponse(
+            next_cursor=next_cursor,
+            results=cls._results(results, fields)
         )
 
 
 class ProjectsPagination(PaginationInterface):
+    no_items_message = "You don't have any project!"
+    sparse_schema = SparsePaginationProject
 
     @staticmethod
-    async def _count_query(
-        session: AsyncSession,
+    def _filter(
         model: ProjectSchema,
         user_id: int,
         project_id: int | None = None,
-    ):
-        count_query = (
-            select(func.count())
-            .select_from(model)
-            .where(model.author_id == user_id)
-        )
-        count = await session.scalar(count_query)
-
-        if count == 0:
-            return NoItemsResponse(results="You don't have any project!")
-        return count
+        filters: dict | None = None
+    ) -> tuple:
+        return (model.author_id == user_id,)
 
     @staticmethod
-    async def _items_query(
-        session: AsyncSession,
+    def _summary(
         model: ProjectSchema,
         user_id: int,
-        offset: int,
-        limit: int,
         project_id: int | None = None,
+        filters: dict | None = None,
+        with_count: bool = True
     ):
-        results_query = (
-            select(model)
-            .where(model.author_id == user_id)
-            .order_by(model.favorite.desc(), model.created)
-            .offset(offset)
+        return (
+            select(
+                true().label("parent_exists"),
+                User.projects_count.label("count")
+            )
+            .where(User.id == user_id)
+        )
+
+    @staticmethod
+    def _order(model: ProjectSchema, filters: dict | None = None) -> tuple:
+        return (
+            (model.favorite, True),
+            (model.created, False),
+            (model.id, False)
+        )
+
+    @staticmethod
+    def _embed(query, items, user_id: int, limit: int):
+        # Read backwards from the end of issue_created_idx of every project.
+        issues = (
+            select(Issue)
+            .where(Issue.author_id == user_id, Issue.project_id == items.c.id)
+            .order_by(Issue.created.desc(), Issue.id.desc())
             .limit(limit)
+            .lateral()
+        )
+        return query.add_columns(aliased(Issue, issues)).outerjoin(
+            issues, true()
         )
-        return await session.scalars(results_query)
+
+    @staticmethod
+    def _embedded_items(rows: list) -> list[EmbeddedPaginationProject]:
+        # Every project is repeated for each of its issues.
+        issues = {}
+
+        for *_, project, issue in rows:
+            if project is not None:
+                project_issues = issues.setdefault(project, [])
+
+                if issue is not None:
+                    project_issues.append(issue)
+
+        return [
+            EmbeddedPaginationProject(
+                **PaginationProject.model_validate(project).model_dump(),
+                issues=project_issues
+            )
+            for project, project_issues in issues.items()
+        ]
 
 
 class IssuesPagination(PaginationInterface):
+    no_items_message = "You don't have any issues for this project!"
+    sparse_schema = SparsePaginationIssue
 
     @staticmethod
-    async def _is_project_exist_query(
-        session: AsyncSession,
+    def _filter(
         model: IssueSchema,
         user_id: int,
         project_id: int,
-    ):
-        _is_project_exist_query = (
-            select(Project)
-            .where(Project.author_id == user_id, Project.id == project_id)
-        )
-        is_project_exist = await session.scalar(_is_project_exist_query)
-
-        if not is_project_exist:
-            raise HTTPException(404, "Project not found!")
+        filters: dict | None = None
+    ) -> tuple:
+        filters = filters or {}
+        conditions = [
+            model.author_id == user_id,
+            model.project_id == project_id
+        ]
+
+        for name in ("status", "priority", "type"):
+            if name in filters:
+                conditions.append(
+                    getattr(model, name).in_(filters[name])
+                )
+        return tuple(conditions)
 
     @staticmethod
-    async def _count_query(
-        session: AsyncSession,
+    def _summary(
         model: IssueSchema,
         user_id: int,
         project_id: int,
+        filters: dict | None = None,
+        with_count: bool = True
     ):
-        await IssuesPagination._is_project_exist_query(
-            session,
-            model,
-            user_id,
-            project_id
+        filters = filters or {}
+        is_project = and_(
+            Project.author_id == user_id,
+            Project.id == project_id
         )
 
-        count_query = (
-            select(func.count())
-            .select_from(model)
-            .where(model.author_id == user_id, model.project_id == project_id)
-        )
-        count = await session.scalar(count_query)
+        if "priority" in filters or "type" in filters:
+            count = null()
+
+            if with_count:
+                # There are no counters for these, so the issues are counted.
+                count = (
+                    select(func.count())
+                    .select_from(model)
+                    .where(
+                        *IssuesPagination._filter(
+                            model, user_id, project_id, filters
+                        )
+                    )
+                    .scalar_subquery()
+                )
+            return select(
+                exists().where(is_project).label("parent_exists"),
+                count.label("count")
+            )
 
-        if count == 0:
-            return NoItemsResponse(
-                results="You don't have any issues for this project!"
+        if "status" in filters:
+            counters = [
+                STATUS_COUNTERS[status] for status in filters["status"]
+            ]
+            count = sum(counters[1:], counters[0])
+        else:
+            count = Project.issues_count
+
+        # Aggregates return a row even if there is no such project.
+        return (
+            select(
+                (func.count() > 0).label("parent_exists"),
+                func.coalesce(func.max(count), 0).label("count")
             )
-        return count
+            .where(is_project)
+        )
 
     @staticmethod
-    async def _items_query(
-        session: AsyncSession,
-        model: IssueSchema,
-        user_id: int,
-        offset: int,
-        limit: int,
-        project_id: int
-    ):
-        results_query = (
-            select(model)
-            .where(model.author_id == user_id, model.project_id == project_id)
-            .order_by(model.type, model.created)
-            .offset(offset)
-            .limit(limit)
+    def _order(model: IssueSchema, filters: dict | None = None) -> tuple:
+        sort = (filters or {}).get("sort", IssueSort.type.value)
+        descending = sort.startswith("-")
+
+        if sort == IssueSort.type.value:
+            return (
+                (model.type, False),
+                (model.created, False),
+                (model.id, False)
+            )
+        return (
+            (getattr(model, sort.lstrip("-")), descending),
+            (model.id, descending)
         )
-        return await session.scalars(results_query)
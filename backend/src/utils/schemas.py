@@ -0,0 +1,18 @@
+from pydantic import BaseModel, model_serializer
+
+
+class SparseSchema(BaseModel):
+    """
+    Schema with only some of the fields of a resource (see fields= param).
+
+    All the fields are optional and only the passed ones are serialized,
+    so the response has exactly the requested fields.
+    """
+
+    @model_serializer(mode="wrap")
+    def _serialize_set_fields(self, handler):
+        return {
+            name: value
+            for name, value in handler(self).items()
+            if name in self.model_fields_set
+        }